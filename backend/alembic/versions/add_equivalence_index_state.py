@@ -0,0 +1,34 @@
+"""add_equivalence_index_state
+
+Revision ID: add_equivalence_index_state
+Revises: add_parts_changes_index
+Create Date: 2026-10-16
+
+Adds equivalence_index_state, a single-row version counter bumped in the
+same transaction as every equivalence group change. API workers holding an
+in-memory equivalence index compare it with their own version to detect
+changes made by other workers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_equivalence_index_state'
+down_revision = 'add_parts_changes_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'equivalence_index_state',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.CheckConstraint('id = 1', name='ck_equivalence_index_state_single_row')
+    )
+    op.execute("INSERT INTO equivalence_index_state (id, version) VALUES (1, 0)")
+
+
+def downgrade():
+    op.drop_table('equivalence_index_state')
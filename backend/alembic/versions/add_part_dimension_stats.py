@@ -0,0 +1,74 @@
+"""add_part_dimension_stats
+
+Revision ID: add_part_dimension_stats
+Revises: add_part_id_normalized
+Create Date: 2026-10-16
+
+Adds part_dimension_stats (per part_name_en volumetric ratio statistics)
+and a partial expression index so dimension suggestions are read in
+ratio order straight from an index.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_part_dimension_stats'
+down_revision = 'add_part_id_normalized'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'part_dimension_stats',
+        sa.Column('part_name_en', sa.String(length=60), nullable=False),
+        sa.Column('part_count', sa.Integer(), nullable=False),
+        sa.Column('ratio_p10', sa.Numeric(20, 4), nullable=True),
+        sa.Column('ratio_median', sa.Numeric(20, 4), nullable=True),
+        sa.Column('ratio_p90', sa.Numeric(20, 4), nullable=True),
+        sa.Column('best_part_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['part_name_en'], ['part_translation_standardization.part_name_en'], ondelete='CASCADE'
+        ),
+        sa.ForeignKeyConstraint(['best_part_id'], ['parts.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('part_name_en')
+    )
+    
+    # Approved parts with complete dimensions, ordered by volumetric ratio per name
+    op.execute("""
+        CREATE INDEX ix_parts_dimension_ratio ON parts
+            (part_name_en, ((length * width * height) / weight))
+        WHERE approval_status = 'APPROVED' AND deleted_at IS NULL
+            AND length > 0 AND width > 0 AND height > 0 AND weight > 0
+    """)
+    
+    # Initial backfill
+    op.execute("""
+        INSERT INTO part_dimension_stats (
+            part_name_en, part_count, ratio_p10, ratio_median, ratio_p90, best_part_id, updated_at
+        )
+        SELECT
+            r.part_name_en,
+            count(*),
+            percentile_cont(0.1) WITHIN GROUP (ORDER BY r.ratio),
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY r.ratio),
+            percentile_cont(0.9) WITHIN GROUP (ORDER BY r.ratio),
+            (array_agg(r.id ORDER BY r.ratio, r.part_id))[1],
+            now()
+        FROM (
+            SELECT p.part_name_en, p.id, p.part_id, (p.length * p.width * p.height) / p.weight AS ratio
+            FROM parts p
+            WHERE p.part_name_en IS NOT NULL
+              AND p.approval_status = 'APPROVED' AND p.deleted_at IS NULL
+              AND p.length > 0 AND p.width > 0 AND p.height > 0 AND p.weight > 0
+        ) r
+        GROUP BY r.part_name_en
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_parts_dimension_ratio")
+    op.drop_table('part_dimension_stats')
@@ -0,0 +1,42 @@
+"""add_part_id_normalized
+
+Revision ID: add_part_id_normalized
+Revises: add_parts_trgm_search
+Create Date: 2026-10-16
+
+Adds parts.part_id_normalized, a stored generated column (uppercase,
+punctuation and whitespace stripped) with a btree index, so any supplier
+spelling of a part number resolves with an index lookup.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_part_id_normalized'
+down_revision = 'add_parts_trgm_search'
+branch_labels = None
+depends_on = None
+
+# Must match app.core.part_numbers.NORMALIZED_PART_ID_SQL
+NORMALIZED_PART_ID_SQL = "upper(regexp_replace(part_id, '[^0-9A-Za-z]', '', 'g'))"
+
+
+def upgrade():
+    # Generated column: Postgres computes it on every INSERT/UPDATE/COPY,
+    # so ORM writes and set-based bulk paths can never leave it stale
+    op.add_column(
+        'parts',
+        sa.Column(
+            'part_id_normalized',
+            sa.String(length=12),
+            sa.Computed(NORMALIZED_PART_ID_SQL, persisted=True),
+            nullable=True
+        )
+    )
+    op.create_index('ix_parts_part_id_normalized', 'parts', ['part_id_normalized'])
+
+
+def downgrade():
+    op.drop_index('ix_parts_part_id_normalized', table_name='parts')
+    op.drop_column('parts', 'part_id_normalized')
@@ -0,0 +1,52 @@
+"""add_parts_change_xid
+
+Revision ID: add_parts_change_xid
+Revises: add_parts_equivalence_changed_indexes
+Create Date: 2026-10-16
+
+Adds parts.change_xid, the id of the transaction that last wrote the row,
+set by a trigger on every insert and update, plus a (change_xid, id) index.
+The GET /parts/changes feed pages on it and only returns rows whose
+transaction id is below the current snapshot's xmin, i.e. rows written by
+transactions that have all finished. A transaction that commits late can
+therefore never land behind a cursor the way an updated_at stamp can.
+Existing rows start at 0.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_change_xid'
+down_revision = 'add_parts_equivalence_changed_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('parts', sa.Column('change_xid', sa.BigInteger(), nullable=False, server_default='0'))
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_parts_change_xid()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_parts_change_xid
+        BEFORE INSERT OR UPDATE ON parts
+        FOR EACH ROW
+        EXECUTE FUNCTION set_parts_change_xid();
+    """)
+    
+    op.create_index('ix_parts_change_xid_id', 'parts', ['change_xid', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_parts_change_xid_id', table_name='parts')
+    op.execute("DROP TRIGGER IF EXISTS trigger_parts_change_xid ON parts")
+    op.execute("DROP FUNCTION IF EXISTS set_parts_change_xid()")
+    op.drop_column('parts', 'change_xid')
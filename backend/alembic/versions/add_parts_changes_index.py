@@ -0,0 +1,26 @@
+"""add_parts_changes_index
+
+Revision ID: add_parts_changes_index
+Revises: add_parts_metadata_gin
+Create Date: 2026-10-16
+
+Adds a btree index on parts (updated_at, id). GET /parts/changes uses it to
+find the starting point when a client passes an ISO-8601 timestamp; the feed
+itself pages on change_xid (see add_parts_change_xid).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_changes_index'
+down_revision = 'add_parts_metadata_gin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_parts_updated_at_id', 'parts', ['updated_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_parts_updated_at_id', table_name='parts')
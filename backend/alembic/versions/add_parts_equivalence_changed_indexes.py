@@ -0,0 +1,31 @@
+"""add_parts_equivalence_changed_indexes
+
+Revision ID: add_parts_equivalence_changed_indexes
+Revises: add_parts_equivalence_history_indexes
+Create Date: 2026-10-16
+
+Adds a partial index on parts_equivalence.deleted_at so the equivalence
+consistency check can find links deleted since a point in time without
+scanning the table; links created since then use idx_parts_equiv_created_at
+from add_equivalence_groups.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_equivalence_changed_indexes'
+down_revision = 'add_parts_equivalence_history_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_parts_equiv_deleted_at', 'parts_equivalence', ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_parts_equiv_deleted_at', table_name='parts_equivalence')
@@ -0,0 +1,74 @@
+"""add_parts_equivalence_history_indexes
+
+Revision ID: add_parts_equivalence_history_indexes
+Revises: undirected_parts_equivalence
+Create Date: 2026-10-16
+
+Keeps every lifetime of a link as its own parts_equivalence row, so
+point-in-time lookups (?as_of=) also see links that were deleted and
+re-created: the full unique constraint uq_parts_equivalence_parts becomes a
+partial unique index over active links only, and re-linking inserts a new
+row instead of reactivating the deleted one.
+
+Adds (part_id, created_at, deleted_at) INCLUDE (equivalent_part_id) and
+(equivalent_part_id, created_at, deleted_at) INCLUDE (part_id) indexes. They
+cover every column a step of the as_of traversal reads, so each step is an
+index-only scan (heap fetches only for pages not yet all-visible) regardless
+of how many deleted links exist. They lead with the same columns
+as idx_parts_equiv_part_id and idx_parts_equiv_equiv_id, which are dropped.
+
+Downgrade keeps only the latest row of each pair (the active one if any)
+before restoring the full unique constraint.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_equivalence_history_indexes'
+down_revision = 'undirected_parts_equivalence'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'uq_parts_equivalence_active', 'parts_equivalence',
+        ['part_id', 'equivalent_part_id'],
+        unique=True,
+        postgresql_where=sa.text('deleted_at IS NULL')
+    )
+    op.drop_constraint('uq_parts_equivalence_parts', 'parts_equivalence', type_='unique')
+    
+    op.create_index(
+        'ix_parts_equiv_part_history', 'parts_equivalence',
+        ['part_id', 'created_at', 'deleted_at'],
+        postgresql_include=['equivalent_part_id']
+    )
+    op.create_index(
+        'ix_parts_equiv_equivalent_history', 'parts_equivalence',
+        ['equivalent_part_id', 'created_at', 'deleted_at'],
+        postgresql_include=['part_id']
+    )
+    op.drop_index('idx_parts_equiv_equiv_id', table_name='parts_equivalence')
+    op.drop_index('idx_parts_equiv_part_id', table_name='parts_equivalence')
+
+
+def downgrade():
+    op.create_index('idx_parts_equiv_part_id', 'parts_equivalence', ['part_id'],
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_parts_equiv_equiv_id', 'parts_equivalence', ['equivalent_part_id'],
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('ix_parts_equiv_equivalent_history', table_name='parts_equivalence')
+    op.drop_index('ix_parts_equiv_part_history', table_name='parts_equivalence')
+    
+    op.execute("""
+        DELETE FROM parts_equivalence pe
+        USING parts_equivalence newer
+        WHERE newer.part_id = pe.part_id
+          AND newer.equivalent_part_id = pe.equivalent_part_id
+          AND (newer.deleted_at IS NULL, newer.created_at, newer.id)
+              > (pe.deleted_at IS NULL, pe.created_at, pe.id)
+    """)
+    op.create_unique_constraint('uq_parts_equivalence_parts', 'parts_equivalence', ['part_id', 'equivalent_part_id'])
+    op.drop_index('uq_parts_equivalence_active', table_name='parts_equivalence')
@@ -0,0 +1,31 @@
+"""add_parts_metadata_gin
+
+Revision ID: add_parts_metadata_gin
+Revises: add_part_dimension_stats
+Create Date: 2026-10-16
+
+Adds a GIN index (jsonb_path_ops) on parts.part_metadata so containment
+(@>) and jsonpath (@?) filters on supplier attributes use the index.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_metadata_gin'
+down_revision = 'add_part_dimension_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_parts_part_metadata',
+        'parts',
+        ['part_metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'part_metadata': 'jsonb_path_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_parts_part_metadata', table_name='parts')
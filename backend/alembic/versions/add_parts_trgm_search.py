@@ -0,0 +1,38 @@
+"""add_parts_trgm_search
+
+Revision ID: add_parts_trgm_search
+Revises: add_hscode_approval
+Create Date: 2026-10-16
+
+Adds pg_trgm GIN indexes so substring (ILIKE '%x%') and similarity
+search on parts.part_id / parts.designation no longer scan the table.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_parts_trgm_search'
+down_revision = 'add_hscode_approval'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    op.create_index(
+        'ix_parts_part_id_trgm', 'parts', ['part_id'],
+        postgresql_using='gin',
+        postgresql_ops={'part_id': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_parts_designation_trgm', 'parts', ['designation'],
+        postgresql_using='gin',
+        postgresql_ops={'designation': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_parts_designation_trgm', table_name='parts')
+    op.drop_index('ix_parts_part_id_trgm', table_name='parts')
+    # pg_trgm extension is left installed; other objects may depend on it
@@ -0,0 +1,110 @@
+"""undirected_parts_equivalence
+
+Revision ID: undirected_parts_equivalence
+Revises: add_equivalence_index_state
+Create Date: 2026-10-16
+
+Stores each equivalence link once instead of twice:
+- Drops the ensure_bidirectional_equivalence trigger
+- Deduplicates mirrored rows (keeping the active / oldest one) and removes self links
+- Orients every row as part_id < equivalent_part_id, enforced by a CHECK;
+  uq_parts_equivalence_parts then makes each unordered pair unique
+- Adds the parts_equivalence_symmetric view listing both directions for readers
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'undirected_parts_equivalence'
+down_revision = 'add_equivalence_index_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP TRIGGER IF EXISTS trigger_bidirectional_equivalence ON parts_equivalence")
+    op.execute("DROP FUNCTION IF EXISTS ensure_bidirectional_equivalence()")
+    
+    print("Deduplicating mirrored equivalence rows...")
+    op.execute("DELETE FROM parts_equivalence WHERE part_id = equivalent_part_id")
+    op.execute("""
+        DELETE FROM parts_equivalence pe
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY least(part_id, equivalent_part_id), greatest(part_id, equivalent_part_id)
+                ORDER BY (deleted_at IS NULL) DESC, created_at, id
+            ) AS rn
+            FROM parts_equivalence
+        ) ranked
+        WHERE pe.id = ranked.id AND ranked.rn > 1
+    """)
+    op.execute("""
+        UPDATE parts_equivalence
+        SET part_id = equivalent_part_id, equivalent_part_id = part_id
+        WHERE part_id > equivalent_part_id
+    """)
+    
+    op.create_check_constraint(
+        'ck_parts_equivalence_canonical', 'parts_equivalence', 'part_id < equivalent_part_id'
+    )
+    
+    op.execute("""
+        CREATE VIEW parts_equivalence_symmetric AS
+        SELECT id, part_id, equivalent_part_id, created_at, created_by, deleted_at, deleted_by
+        FROM parts_equivalence
+        UNION ALL
+        SELECT id, equivalent_part_id, part_id, created_at, created_by, deleted_at, deleted_by
+        FROM parts_equivalence
+    """)
+    
+    op.execute("ANALYZE parts_equivalence")
+
+
+def downgrade():
+    op.execute("DROP VIEW IF EXISTS parts_equivalence_symmetric")
+    op.drop_constraint('ck_parts_equivalence_canonical', 'parts_equivalence', type_='check')
+    
+    # Restore the mirrored rows and the trigger that maintains them
+    op.execute("""
+        INSERT INTO parts_equivalence (
+            id, part_id, equivalent_part_id, created_at, created_by, deleted_at, deleted_by
+        )
+        SELECT gen_random_uuid(), equivalent_part_id, part_id, created_at, created_by, deleted_at, deleted_by
+        FROM parts_equivalence
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_bidirectional_equivalence()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Only create reverse if this is an INSERT
+            IF (TG_OP = 'INSERT') THEN
+                -- Check if reverse already exists
+                IF NOT EXISTS (
+                    SELECT 1 FROM parts_equivalence 
+                    WHERE part_id = NEW.equivalent_part_id 
+                    AND equivalent_part_id = NEW.part_id
+                    AND deleted_at IS NULL
+                ) THEN
+                    -- Auto-insert reverse relationship
+                    INSERT INTO parts_equivalence (
+                        id, part_id, equivalent_part_id, 
+                        created_at, created_by
+                    ) VALUES (
+                        gen_random_uuid(),
+                        NEW.equivalent_part_id,
+                        NEW.part_id,
+                        NEW.created_at,
+                        NEW.created_by
+                    );
+                END IF;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trigger_bidirectional_equivalence
+        AFTER INSERT ON parts_equivalence
+        FOR EACH ROW
+        EXECUTE FUNCTION ensure_bidirectional_equivalence();
+    """)
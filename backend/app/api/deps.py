@@ -4,10 +4,10 @@ API dependencies
 from typing import Generator
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
-from app.core.security import get_current_user, get_current_active_user
+from app.core.security import get_current_user, get_current_active_user, get_current_superuser
 
 # Re-export for convenience
-__all__ = ["get_db", "get_current_user", "get_current_active_user"]
+__all__ = ["get_db", "get_current_user", "get_current_active_user", "get_current_superuser"]
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -273,6 +273,11 @@ def approve_part(
     )
     db.add(approval_log)
     
+    # Newly approved parts count towards the dimension statistics
+    db.flush()
+    from app.services.dimension_stats import DimensionStatsService
+    DimensionStatsService.refresh(db, [part.part_name_en])
+    
     db.commit()
     db.refresh(part)
     
@@ -1,22 +1,41 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.classification import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryTree
+from app.core.http_cache import conditional_response, list_validators
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CategoryResponse])
 def read_categories(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (lean mode)"),
 ) -> Any:
     """
     Retrieve categories.
     """
-    categories = db.query(Category).offset(skip).limit(limit).all()
+    query = db.query(Category)
+    
+    # Validate ?fields= first, so a bad value is a 400 rather than a 304
+    sparse_columns = parse_fields(Category, CategoryResponse, fields)
+    
+    last_modified, count = list_validators(query, Category.updated_at)
+    not_modified = conditional_response(request, response, (last_modified, count), last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    if sparse_columns is not None:
+        rows = query.with_entities(*sparse_columns).offset(skip).limit(limit).all()
+        return fields_response(rows_to_items(rows), response)
+    
+    categories = query.offset(skip).limit(limit).all()
     return categories
 
 @router.post("/", response_model=CategoryResponse)
@@ -1,7 +1,9 @@
 from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from app.api import deps
+from app.core.http_cache import conditional_response, list_validators
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
 from app.models.classification import HSCode, HSCodeTariff
 from app.schemas.hs_code import (
     HSCode as HSCodeSchema,
@@ -25,15 +27,19 @@ router = APIRouter()
 # HS Codes CRUD
 @router.get("/")
 def read_hs_codes(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     search: str = "",
-    approval_status: str = Query(ApprovalStatus.APPROVED, description="Filter by approval status")
+    approval_status: str = Query(ApprovalStatus.APPROVED, description="Filter by approval status"),
+    fields: str = Query(None, description="Comma-separated columns to return (lean mode)")
 ) -> Any:
     """
     Retrieve HS codes with pagination.
     """
+    sparse_columns = parse_fields(HSCode, HSCodeSchema, fields, always=("hs_code",))
     query = db.query(HSCode)
     
     if approval_status:
@@ -45,10 +51,23 @@ def read_hs_codes(
             (HSCode.description_en.ilike(f"%{search}%"))
         )
     
-    # Get total count
-    total = query.count()
+    # Get total count (together with max(updated_at) for conditional requests)
+    last_modified, total = list_validators(query, HSCode.updated_at)
+    not_modified = conditional_response(request, response, (last_modified, total), last_modified)
+    if not_modified is not None:
+        return not_modified
     
     # Get paginated results
+    if sparse_columns is not None:
+        rows = query.with_entities(*sparse_columns).order_by(HSCode.hs_code).offset(skip).limit(limit).all()
+        return fields_response({
+            "items": rows_to_items(rows),
+            "total": total,
+            "page": skip // limit + 1 if limit > 0 else 1,
+            "page_size": limit,
+            "pages": (total + limit - 1) // limit if limit > 0 else 1
+        }, response)
+    
     hs_codes = query.order_by(HSCode.hs_code).offset(skip).limit(limit).all()
     
     # Convert to schemas
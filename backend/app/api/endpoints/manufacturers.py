@@ -1,22 +1,41 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.manufacturer import Manufacturer
 from app.schemas.manufacturer import ManufacturerCreate, ManufacturerUpdate, ManufacturerResponse
+from app.core.http_cache import conditional_response, list_validators
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ManufacturerResponse])
 def read_manufacturers(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (lean mode)"),
 ) -> Any:
     """
     Retrieve manufacturers.
     """
-    manufacturers = db.query(Manufacturer).filter(Manufacturer.deleted_at.is_(None)).offset(skip).limit(limit).all()
+    query = db.query(Manufacturer).filter(Manufacturer.deleted_at.is_(None))
+    
+    # Validate ?fields= first, so a bad value is a 400 rather than a 304
+    sparse_columns = parse_fields(Manufacturer, ManufacturerResponse, fields)
+    
+    last_modified, count = list_validators(query, Manufacturer.updated_at)
+    not_modified = conditional_response(request, response, (last_modified, count), last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    if sparse_columns is not None:
+        rows = query.with_entities(*sparse_columns).offset(skip).limit(limit).all()
+        return fields_response(rows_to_items(rows), response)
+    
+    manufacturers = query.offset(skip).limit(limit).all()
     return manufacturers
 
 @router.post("/", response_model=ManufacturerResponse)
@@ -75,6 +94,8 @@ def read_manufacturer(
     *,
     db: Session = Depends(deps.get_db),
     manufacturer_id: str,
+    request: Request,
+    response: Response,
 ) -> Any:
     """
     Get manufacturer by ID.
@@ -85,6 +106,10 @@ def read_manufacturer(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Manufacturer not found",
         )
+    
+    not_modified = conditional_response(request, response, (manufacturer.updated_at,), manufacturer.updated_at)
+    if not_modified is not None:
+        return not_modified
     return manufacturer
 
 @router.delete("/{manufacturer_id}", response_model=ManufacturerResponse)
@@ -1,18 +1,38 @@
 from typing import List, Any, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy import select, and_, or_, func, literal, text, any_, bindparam, String, BigInteger, exists, null, cast, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, JSONPATH, UUID as PG_UUID
 from app.api import deps
 from app.models.part import Part, parts_equivalence
 from app.models.manufacturer import Manufacturer
 from app.models.translation import PartTranslationStandardization, PositionTranslation
 from app.schemas.part import (
     PartCreate, PartUpdate, PartResponse, PartListResponse, PartFilter,
-    PartEquivalenceCreate, PartEquivalenceResponse, PartEquivalenceBulkCreate
+    PartLookupRequest, PartLookupResponse, PartImportResult, PartChangesResponse,
+    PartBulkUpdateRequest, PartBulkDeleteRequest, PartBulkResult,
+    PartEquivalenceCreate, PartEquivalenceResponse, PartEquivalenceBulkCreate,
+    PartEquivalenceBatchRequest, PartEquivalenceBatchResponse, PartEquivalenceCheckResult
 )
 from app.core.audit import log_audit
+from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.part_numbers import normalize_part_number
+from app.core.pagination import encode_cursor, decode_cursor, estimate_count
+from app.core.http_cache import conditional_response
+from app.core.cache import TTLCache
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
+from app.services.dimension_stats import (
+    DimensionStatsService, DIMENSION_STATS_FIELDS, qualifies, qualifying_filters, volumetric_ratio_expr
+)
+from datetime import datetime
+from decimal import Decimal
 from math import ceil
+import csv
+import io
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,31 +58,35 @@ def make_json_serializable(obj):
     return obj
 
 
-@router.get("/", response_model=PartListResponse)
-def read_parts(
-    db: Session = Depends(deps.get_db),
-    search: Optional[str] = Query(None),
-    mfg_id: Optional[str] = Query(None),
-    part_name_en: Optional[str] = Query(None),
-    drive_side: Optional[str] = Query(None),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-) -> Any:
-    """
-    Retrieve parts with filtering and pagination.
-    """
-    query = db.query(Part).options(
-        joinedload(Part.manufacturer),
-        joinedload(Part.part_translation),
-        joinedload(Part.position)
-    )
-    
-    # Search filter
+def filter_parts_query(
+    query,
+    search: Optional[str] = None,
+    mfg_id: Optional[str] = None,
+    part_name_en: Optional[str] = None,
+    drive_side: Optional[str] = None,
+    min_similarity: Optional[float] = None,
+    metadata: Optional[dict] = None,
+    metadata_keys: Optional[List[str]] = None,
+):
+    """Apply the standard parts list filters to a query"""
+    # Search filter: substring match, or trigram similarity above the threshold
+    # (both served by the pg_trgm GIN indexes on part_id and designation)
     if search:
+        threshold = min_similarity if min_similarity is not None else settings.PARTS_SEARCH_MIN_SIMILARITY
+        query.session.execute(
+            text(
+                "SELECT set_config('pg_trgm.similarity_threshold', :t, true), "
+                "set_config('pg_trgm.word_similarity_threshold', :t, true)"
+            ),
+            {"t": str(threshold)}
+        )
         query = query.filter(
             or_(
                 Part.part_id.ilike(f"%{search}%"),
-                Part.designation.ilike(f"%{search}%")
+                Part.designation.ilike(f"%{search}%"),
+                Part.part_id.op('%')(search),
+                literal(search).op('<%')(Part.designation),
+                Part.part_id_normalized == normalize_part_number(search)
             )
         )
     
@@ -78,6 +102,16 @@ def read_parts(
     if drive_side and drive_side in ['NA', 'LHD', 'RHD']:
         query = query.filter(Part.drive_side == drive_side)
     
+    # Metadata filters: containment (@>) and key existence. Key existence is
+    # expressed as a jsonpath match (@?) because the jsonb_path_ops GIN index
+    # serves @>, @? and @@ but not the ? operator
+    if metadata:
+        query = query.filter(Part.part_metadata.contains(metadata))
+    for key in metadata_keys or []:
+        query = query.filter(
+            Part.part_metadata.op('@?')(cast(literal(f"$.{json.dumps(key)}"), JSONPATH))
+        )
+    
     # Filter out soft-deleted items
     query = query.filter(Part.deleted_at.is_(None))
 
@@ -86,20 +120,330 @@ def read_parts(
     from app.models.approval import ApprovalStatus
     query = query.filter(Part.approval_status == ApprovalStatus.APPROVED)
     
-    # Count total
-    total = query.count()
+    return query
+
+
+FACET_COLUMNS = {
+    "mfg_id": Part.mfg_id,
+    "part_name_en": Part.part_name_en,
+    "drive_side": Part.drive_side,
+}
+
+_facet_cache = TTLCache(ttl=settings.PARTS_FACET_CACHE_TTL)
+
+
+def compute_part_facets(db: Session, query, facet_names: List[str], cache_key: Any = None) -> dict:
+    """
+    Count the filtered parts per value of each requested facet.
+    All facets are computed in one pass with GROUP BY GROUPING SETS.
+    Results are cached briefly per filter fingerprint when cache_key is given.
+    """
+    if cache_key is not None:
+        cached = _facet_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    columns = [FACET_COLUMNS[name] for name in facet_names]
+    rows = query.order_by(None).with_entities(
+        *columns,
+        *[func.grouping(column) for column in columns],
+        func.count()
+    ).group_by(func.grouping_sets(*columns)).all()
     
-    # Pagination
-    skip = (page - 1) * page_size
-    parts = query.offset(skip).limit(page_size).all()
+    facets = {name: [] for name in facet_names}
+    for row in rows:
+        values = row[:len(columns)]
+        grouping = row[len(columns):-1]
+        for index, name in enumerate(facet_names):
+            # grouping() is 0 for the column this grouping set groups by
+            if grouping[index] == 0:
+                value = values[index]
+                facets[name].append({
+                    "value": str(value) if value is not None else None,
+                    "count": row[-1]
+                })
     
-    return {
+    # Manufacturer facet values are UUIDs; add readable names
+    if "mfg_id" in facets:
+        mfg_ids = [f["value"] for f in facets["mfg_id"] if f["value"]]
+        names = dict(db.query(Manufacturer.id, Manufacturer.mfg_name).filter(
+            Manufacturer.id.in_(mfg_ids)
+        ).all()) if mfg_ids else {}
+        for facet in facets["mfg_id"]:
+            if facet["value"]:
+                facet["label"] = names.get(UUID(facet["value"]))
+    
+    for values in facets.values():
+        values.sort(key=lambda f: (-f["count"], f["value"] or ""))
+    
+    if cache_key is not None:
+        _facet_cache.set(cache_key, facets)
+    return facets
+
+
+def parse_metadata_filters(metadata: Optional[str], metadata_has: Optional[str]):
+    """
+    Parse the ?metadata= (JSON object) and ?metadata_has= (comma-separated keys)
+    query parameters into filter_parts_query arguments.
+    """
+    metadata_filter = None
+    if metadata:
+        try:
+            metadata_filter = json.loads(metadata)
+        except ValueError:
+            metadata_filter = None
+        if not isinstance(metadata_filter, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail='metadata must be a JSON object, e.g. {"voltage": "24V"}',
+            )
+    metadata_keys = [k.strip() for k in metadata_has.split(",") if k.strip()] if metadata_has else []
+    return metadata_filter, metadata_keys
+
+
+def part_search_rank(search: str):
+    """Relevance of a part to a search term (0..1, higher is better)"""
+    return func.greatest(
+        func.similarity(Part.part_id, search),
+        func.word_similarity(search, func.coalesce(Part.designation, ''))
+    )
+
+
+def part_list_validators(query, collapse: bool = False):
+    """
+    Conditional GET validators for a filtered parts list, in one query:
+    max(updated_at) over the parts and the manufacturer, translation and
+    position rows embedded in each item (as the detail endpoint does), and
+    the count. With collapse, the count is of equivalence groups and the
+    number of matching parts is included as well.
+    Returns (last_modified, total, validators).
+    """
+    counts = [func.count()]
+    if collapse:
+        counts.insert(0, func.count(func.distinct(func.coalesce(Part.equivalence_group_id, Part.id))))
+    row = query.order_by(None).outerjoin(
+        Manufacturer, Part.mfg_id == Manufacturer.id
+    ).outerjoin(
+        PartTranslationStandardization,
+        Part.part_name_en == PartTranslationStandardization.part_name_en
+    ).outerjoin(
+        PositionTranslation, Part.position_id == PositionTranslation.id
+    ).with_entities(
+        func.max(Part.updated_at),
+        func.max(Manufacturer.updated_at),
+        func.max(PartTranslationStandardization.updated_at),
+        func.max(PositionTranslation.updated_at),
+        *counts
+    ).one()
+    timestamps = [v for v in row[:4] if v is not None]
+    last_modified = max(timestamps) if timestamps else None
+    return last_modified, row[4], tuple(row)
+
+
+def collapse_parts_query(db: Session, query, search: Optional[str] = None):
+    """
+    Collapse a filtered parts query to one representative per equivalence
+    group (ungrouped parts stand for themselves) with DISTINCT ON. The
+    representative is the best search match, then the lowest part_id.
+    Returns (query over the representatives, matching members per group).
+    """
+    group_key = func.coalesce(Part.equivalence_group_id, Part.id)
+    preference = [part_search_rank(search).desc()] if search else []
+    representatives = query.order_by(None).with_entities(
+        Part.id.label("id"),
+        func.count().over(partition_by=group_key).label("member_count")
+    ).distinct(group_key).order_by(group_key, *preference, Part.part_id).subquery("representatives")
+    collapsed = db.query(Part).join(representatives, Part.id == representatives.c.id)
+    return collapsed, representatives.c.member_count
+
+
+@router.get("/", response_model=PartListResponse)
+def read_parts(
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    search: Optional[str] = Query(None),
+    mfg_id: Optional[str] = Query(None),
+    part_name_en: Optional[str] = Query(None),
+    drive_side: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (cursor mode)"),
+    exact_total: Optional[bool] = Query(
+        None, description="Exact COUNT instead of a planner estimate (default: exact in offset mode only)"
+    ),
+    min_similarity: Optional[float] = Query(None, ge=0, le=1, description="Trigram similarity threshold for search"),
+    metadata: Optional[str] = Query(None, description='JSON object the part metadata must contain, e.g. {"voltage": "24V"}'),
+    metadata_has: Optional[str] = Query(None, description="Comma-separated top-level metadata keys that must be present"),
+    facets: Optional[str] = Query(None, description="Comma-separated facet counts to include: mfg_id, part_name_en, drive_side"),
+    fields: Optional[str] = Query(None, description="Comma-separated part columns to return (lean mode, no relationships)"),
+    collapse: Optional[str] = Query(None, pattern="^equivalence_group$", description="equivalence_group: one part per equivalence group"),
+) -> Any:
+    """
+    Retrieve parts with filtering and pagination.
+    
+    Offset mode (default) pages with page/page_size.
+    Cursor mode (pagination=cursor, or any cursor given) pages on the unique part_id
+    index, so every page costs the same as the first one. The total is a planner
+    estimate in cursor mode unless exact_total=true.
+    
+    With a search term, offset-mode results are ordered by relevance.
+    Whenever the exact total is computed, the response carries an ETag and
+    Last-Modified and a matching conditional request gets 304 Not Modified.
+    
+    facets=mfg_id,part_name_en,drive_side adds per-value counts over the whole
+    filtered set, computed in one grouped query.
+    
+    fields=id,part_id,designation returns only those columns from a column-only
+    select (no relationship joins), serialized without PartResponse.
+    
+    metadata={"voltage": "24V"} and metadata_has=voltage,warranty filter on the
+    part_metadata JSONB column through its GIN index.
+    
+    collapse=equivalence_group returns one representative per equivalence group
+    (the best search match, then the lowest part_id) with group_member_count set
+    to the number of its group's parts that match the filters. total and paging
+    count groups; facets still count every matching part.
+    """
+    sparse_columns = parse_fields(Part, PartResponse, fields)
+    metadata_filter, metadata_keys = parse_metadata_filters(metadata, metadata_has)
+    query = filter_parts_query(
+        db.query(Part), search, mfg_id, part_name_en, drive_side, min_similarity,
+        metadata_filter, metadata_keys
+    )
+    eager = (
+        joinedload(Part.manufacturer),
+        joinedload(Part.part_translation),
+        joinedload(Part.position)
+    )
+    
+    use_cursor = pagination == "cursor" or cursor is not None
+    if exact_total is None:
+        exact_total = not use_cursor
+    
+    filtered = query
+    member_count = None
+    if collapse:
+        query, member_count = collapse_parts_query(db, filtered, search)
+    
+    # Count total. The exact count is taken together with max(updated_at), which
+    # also validates conditional requests (ETag / Last-Modified)
+    if exact_total:
+        # Collapsed lists are validated over all filtered parts, so any member
+        # change (not just a representative's) moves the validators
+        last_modified, total, validators = part_list_validators(filtered, collapse=bool(collapse))
+        not_modified = conditional_response(request, response, validators, last_modified)
+        if not_modified is not None:
+            return not_modified
+    else:
+        total = estimate_count(db, query)
+    
+    facet_counts = None
+    if facets:
+        facet_names = list(dict.fromkeys(f.strip() for f in facets.split(",") if f.strip()))
+        unknown = [f for f in facet_names if f not in FACET_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown facet(s): {', '.join(unknown)}",
+            )
+        fingerprint = (
+            search, mfg_id, part_name_en, drive_side, min_similarity,
+            json.dumps(metadata_filter, sort_keys=True), tuple(metadata_keys), tuple(facet_names)
+        )
+        facet_counts = compute_part_facets(db, filtered, facet_names, cache_key=fingerprint)
+    
+    def fetch(page_query):
+        if sparse_columns is None:
+            if member_count is None:
+                return page_query.options(*eager).all()
+            rows = page_query.options(*eager).add_columns(member_count).all()
+            for part, count in rows:
+                part.group_member_count = count
+            return [part for part, _ in rows]
+        # part_id is always selected as the keyset cursor key
+        extra = [member_count.label("group_member_count")] if member_count is not None else []
+        return page_query.with_entities(*sparse_columns, Part.part_id.label("cursor_key"), *extra).all()
+    
+    def build_response(payload):
+        if sparse_columns is None:
+            return payload
+        keys = [c.key for c in sparse_columns] + (["group_member_count"] if member_count is not None else [])
+        payload["items"] = rows_to_items(payload["items"], keys)
+        return fields_response(payload, response)
+    
+    if not use_cursor:
+        # Pagination
+        skip = (page - 1) * page_size
+        if search:
+            query = query.order_by(part_search_rank(search).desc(), Part.part_id)
+        elif collapse:
+            # The join on the DISTINCT ON representatives has no inherent order
+            query = query.order_by(Part.part_id)
+        parts = fetch(query.offset(skip).limit(page_size))
+        
+        return build_response({
+            "items": parts,
+            "total": total,
+            "page": page,
+            "pages": ceil(total / page_size) if total > 0 else 1,
+            "page_size": page_size,
+            "total_is_estimate": not exact_total,
+            "facets": facet_counts
+        })
+    
+    # Keyset pagination: part_id is unique, so it alone is a total order
+    if cursor:
+        cursor_values = decode_cursor(cursor, 1)
+        if cursor_values is None or cursor_values[0] is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        query = query.filter(Part.part_id > cursor_values[0])
+    
+    # Fetch one extra row to know whether there is a next page
+    rows = fetch(query.order_by(Part.part_id).limit(page_size + 1))
+    parts = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = parts[-1]
+        next_cursor = encode_cursor([last.part_id if sparse_columns is None else last.cursor_key])
+    
+    return build_response({
         "items": parts,
         "total": total,
-        "page": page,
+        "page": 1,
         "pages": ceil(total / page_size) if total > 0 else 1,
-        "page_size": page_size
-    }
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "total_is_estimate": not exact_total,
+        "facets": facet_counts
+    })
+
+def check_part_references(
+    db: Session,
+    part_id: Optional[str] = None,
+    mfg_id: Optional[Any] = None,
+    part_name_en: Optional[str] = None,
+    position_id: Optional[Any] = None,
+):
+    """
+    Validate a part's unique key and foreign keys in a single query.
+    Returns a row with duplicate/mfg_found/translation_found/position_found;
+    a check that was not requested yields None.
+    """
+    def check(condition, enabled):
+        return exists().where(condition) if enabled else null()
+    
+    return db.query(
+        check(Part.part_id == part_id, part_id).label("duplicate"),
+        check(Manufacturer.id == mfg_id, mfg_id).label("mfg_found"),
+        check(PartTranslationStandardization.part_name_en == part_name_en, part_name_en).label("translation_found"),
+        check(PositionTranslation.id == position_id, position_id).label("position_found")
+    ).one()
+
 
 @router.post("/", response_model=PartResponse, status_code=status.HTTP_201_CREATED)
 def create_part(
@@ -111,75 +455,66 @@ def create_part(
 ) -> Any:
     """
     Create new part with validation.
+    Uniqueness and foreign keys are checked in one query, and the part, any
+    auto-created translation, dimension statistics and the audit row are
+    written in a single transaction.
     """
+    checks = check_part_references(
+        db,
+        part_id=part_in.part_id,
+        mfg_id=part_in.mfg_id,
+        part_name_en=part_in.part_name_en,
+        position_id=part_in.position_id
+    )
+    
     # Check if part_id already exists
-    existing = db.query(Part).filter(Part.part_id == part_in.part_id).first()
-    if existing:
+    if checks.duplicate:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Part with part_id '{part_in.part_id}' already exists",
         )
     
     # Validate manufacturer exists if provided
-    if part_in.mfg_id:
-        mfg = db.query(Manufacturer).filter(Manufacturer.id == part_in.mfg_id).first()
-        if not mfg:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Manufacturer with id '{part_in.mfg_id}' not found",
-            )
+    if checks.mfg_found is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Manufacturer with id '{part_in.mfg_id}' not found",
+        )
     
-    # Validate/Auto-create part_name_en if provided
-    if part_in.part_name_en:
+    # Validate position_id exists if provided
+    if checks.position_found is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Position with id '{part_in.position_id}' not found",
+        )
+    
+    # Auto-create part_name_en with pending approval if it doesn't exist yet
+    if checks.translation_found is False:
         from app.models.approval import ApprovalStatus
         from datetime import datetime
         
-        # First check for approved translations
-        translation = db.query(PartTranslationStandardization).filter(
-            PartTranslationStandardization.part_name_en == part_in.part_name_en,
-            PartTranslationStandardization.approval_status == ApprovalStatus.APPROVED
-        ).first()
+        logger.info(f"Auto-creating translation '{part_in.part_name_en}' with pending approval status")
         
-        if not translation:
-            # Check if there's already a pending translation
-            pending_translation = db.query(PartTranslationStandardization).filter(
-                PartTranslationStandardization.part_name_en == part_in.part_name_en
-            ).first()
-            
-            if not pending_translation:
-                # Auto-create new translation with pending approval
-                logger.info(f"Auto-creating translation '{part_in.part_name_en}' with pending approval status")
-                
-                # Safely get user ID
-                user_id = getattr(current_user, 'id', None)
-                
-                new_translation = PartTranslationStandardization(
-                    part_name_en=part_in.part_name_en,
-                    approval_status=ApprovalStatus.PENDING_APPROVAL,
-                    submitted_at=datetime.utcnow(),
-                    created_by=user_id
-                )
-                db.add(new_translation)
-                db.flush()  # Get ID without full commit
-    
-    # Validate position_id exists if provided
-    if part_in.position_id:
-        position = db.query(PositionTranslation).filter(
-            PositionTranslation.id == part_in.position_id
-        ).first()
-        if not position:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Position with id '{part_in.position_id}' not found",
-            )
+        # Safely get user ID
+        user_id = getattr(current_user, 'id', None)
+        
+        new_translation = PartTranslationStandardization(
+            part_name_en=part_in.part_name_en,
+            approval_status=ApprovalStatus.PENDING_APPROVAL,
+            submitted_at=datetime.utcnow(),
+            created_by=user_id
+        )
+        db.add(new_translation)
+        db.flush()  # Translation must exist before the part references it
     
     # Create part
     part = Part(**part_in.model_dump())
     db.add(part)
-    db.commit()
-    db.refresh(part)
+    db.flush()  # INSERT ... RETURNING id
+    if qualifies(part):
+        DimensionStatsService.refresh(db, [part.part_name_en])
     
-    # Audit log
+    # Audit log, committed together with the part
     log_audit(
         db=db,
         action="CREATE",
@@ -187,29 +522,535 @@ def create_part(
         entity_id=str(part.id),
         user_id=current_user.id,
         changes={"new": make_json_serializable(part_in.model_dump())},
-        request=request
+        request=request,
+        commit=False
     )
-    logger.info(f"Part {part.part_id} created by user {current_user.username}")
+    new_id = part.id
+    db.commit()
+    logger.info(f"Part {part_in.part_id} created by user {current_user.username}")
     
     # Load relationships
-    db.refresh(part)
     part = db.query(Part).options(
         joinedload(Part.manufacturer),
         joinedload(Part.part_translation),
         joinedload(Part.position)
-    ).filter(Part.id == part.id).first()
+    ).filter(Part.id == new_id).first()
     
     return part
 
+@router.post("/lookup", response_model=PartLookupResponse)
+def lookup_parts(
+    *,
+    db: Session = Depends(deps.get_db),
+    lookup_in: PartLookupRequest,
+) -> Any:
+    """
+    Resolve many parts in one query.
+    Each entry may be a part UUID or a part_id string. Everything is matched with
+    a single `= ANY(:array)` query; entries without a non-deleted match are
+    returned in `missing`.
+    """
+    keys = []
+    uuids = []
+    for raw in lookup_in.part_ids:
+        key = raw.strip()
+        if not key:
+            continue
+        keys.append(key)
+        try:
+            uuids.append(UUID(key))
+        except ValueError:
+            pass
+    
+    if lookup_in.normalize:
+        part_key = Part.part_id_normalized
+        values = list({normalize_part_number(k) for k in keys})
+    else:
+        part_key = Part.part_id
+        values = list(set(keys))
+    
+    parts = db.query(Part).options(
+        joinedload(Part.manufacturer),
+        joinedload(Part.part_translation),
+        joinedload(Part.position)
+    ).filter(
+        or_(
+            part_key == any_(bindparam("part_keys", values, type_=ARRAY(String))),
+            Part.id == any_(bindparam("part_uuids", uuids, type_=ARRAY(PG_UUID(as_uuid=True))))
+        ),
+        Part.deleted_at.is_(None)
+    ).all()
+    
+    # Match each submitted key on its own: by part key, or by its UUID in any
+    # accepted spelling (braces, no hyphens, upper case)
+    found_keys = {part.part_id_normalized if lookup_in.normalize else part.part_id for part in parts}
+    found_ids = {part.id for part in parts}
+    
+    missing = []
+    for key in keys:
+        match_key = normalize_part_number(key) if lookup_in.normalize else key
+        if match_key in found_keys:
+            continue
+        try:
+            if UUID(key) in found_ids:
+                continue
+        except ValueError:
+            pass
+        missing.append(key)
+    
+    return {"items": parts, "missing": missing}
+
+EXPORT_BATCH_SIZE = 2000
+
+# Flat export columns: parts joined to manufacturer, translation and position
+EXPORT_COLUMNS = [
+    Part.id.label("id"),
+    Part.part_id.label("part_id"),
+    Part.designation.label("designation"),
+    Manufacturer.mfg_id.label("mfg_id"),
+    Manufacturer.mfg_name.label("mfg_name"),
+    Part.part_name_en.label("part_name_en"),
+    PartTranslationStandardization.part_name_pr.label("part_name_pr"),
+    PartTranslationStandardization.part_name_fr.label("part_name_fr"),
+    PositionTranslation.position_id.label("position_id"),
+    PositionTranslation.position_en.label("position_en"),
+    Part.drive_side.label("drive_side"),
+    Part.status.label("status"),
+    Part.moq.label("moq"),
+    Part.weight.label("weight"),
+    Part.width.label("width"),
+    Part.length.label("length"),
+    Part.height.label("height"),
+    Part.note.label("note"),
+    Part.image_url.label("image_url"),
+    Part.created_at.label("created_at"),
+    Part.updated_at.label("updated_at"),
+]
+
+
+@router.get("/export")
+def export_parts(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    search: Optional[str] = Query(None),
+    mfg_id: Optional[str] = Query(None),
+    part_name_en: Optional[str] = Query(None),
+    drive_side: Optional[str] = Query(None),
+    metadata: Optional[str] = Query(None),
+    metadata_has: Optional[str] = Query(None),
+    current_user = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Stream the parts catalog as CSV or NDJSON.
+    Accepts the same filters as the parts list. Rows are read through a
+    server-side cursor in batches, so memory use does not depend on catalog size.
+    """
+    metadata_filter, metadata_keys = parse_metadata_filters(metadata, metadata_has)
+    
+    def generate_rows():
+        # The request-scoped session is closed before a streaming body is sent,
+        # so the generator owns its own session
+        db = SessionLocal()
+        try:
+            query = db.query(*EXPORT_COLUMNS).select_from(Part).outerjoin(
+                Manufacturer, Part.mfg_id == Manufacturer.id
+            ).outerjoin(
+                PartTranslationStandardization,
+                Part.part_name_en == PartTranslationStandardization.part_name_en
+            ).outerjoin(
+                PositionTranslation, Part.position_id == PositionTranslation.id
+            )
+            query = filter_parts_query(
+                query, search, mfg_id, part_name_en, drive_side,
+                metadata=metadata_filter, metadata_keys=metadata_keys
+            )
+            rows = query.order_by(Part.part_id).yield_per(EXPORT_BATCH_SIZE)
+            
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if format == "csv":
+                writer.writerow([c.key for c in EXPORT_COLUMNS])
+            
+            for count, row in enumerate(rows, start=1):
+                if format == "csv":
+                    writer.writerow(make_json_serializable(list(row)))
+                else:
+                    buffer.write(json.dumps(make_json_serializable(row._asdict())))
+                    buffer.write("\n")
+                
+                if count % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            
+            yield buffer.getvalue()
+        finally:
+            db.close()
+    
+    if format == "csv":
+        media_type = "text/csv"
+    else:
+        media_type = "application/x-ndjson"
+    
+    return StreamingResponse(
+        generate_rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=parts_export.{format}"}
+    )
+
+@router.post("/bulk-upload", response_model=PartImportResult)
+def bulk_upload_parts(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    restore_deleted: bool = Query(False, description="Restore and update soft-deleted parts instead of rejecting their rows"),
+    current_user = Depends(deps.get_current_active_user),
+    request: Request
+) -> Any:
+    """
+    Bulk import parts from a CSV file.
+    
+    CSV format: part_id,mfg_id,part_name_en,position_id,drive_side,designation,moq,weight,width,length,height,note,image_url
+    Only part_id is required; mfg_id and position_id are manufacturer/position codes.
+    Existing parts (same part_id) are updated, new ones are created. Invalid rows
+    are skipped and reported. Rows for soft-deleted parts are rejected unless
+    restore_deleted=true.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a CSV"
+        )
+    
+    from app.services.part_import import PartImportService
+    
+    stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    try:
+        result = PartImportService.import_csv(db, stream, restore_deleted=restore_deleted)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Parts import failed: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to process file: {str(e)}")
+    finally:
+        stream.detach()
+    
+    # Audit log (commits the import together with the audit row)
+    log_audit(
+        db=db,
+        action="IMPORT",
+        entity_type="parts",
+        entity_id=None,
+        user_id=current_user.id,
+        changes={"new": {
+            "filename": file.filename,
+            "created": result["created"],
+            "updated": result["updated"],
+            "restored": result["restored"],
+            "rejected": result["error_count"]
+        }},
+        request=request
+    )
+    logger.info(
+        f"Parts import by {current_user.username}: {result['created']} created, "
+        f"{result['updated']} updated, {result['error_count']} rejected"
+    )
+    
+    return result
+
+
+def bulk_target_condition(db: Session, ids, bulk_filter):
+    """
+    SQL condition selecting the parts of a bulk request: an explicit id list,
+    or the parts list filters. Exactly one of the two must be given, and a
+    filter must set at least one criterion (an empty one would select the
+    whole catalog).
+    """
+    if (ids is None) == (bulk_filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either ids or filter",
+        )
+    if bulk_filter is not None and not any(bulk_filter.model_dump().values()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filter must set at least one criterion",
+        )
+    if ids is not None:
+        return Part.id == any_(bindparam("bulk_ids", list(ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+    
+    filtered = filter_parts_query(
+        db.query(Part.id),
+        bulk_filter.search,
+        bulk_filter.mfg_id,
+        bulk_filter.part_name_en,
+        bulk_filter.drive_side,
+        metadata=bulk_filter.metadata
+    )
+    return Part.id.in_(filtered.statement.correlate(None))
+
+
+def bulk_item_results(db: Session, ids, rows, status_name: str, missing_status: str) -> List[dict]:
+    """
+    Per-part results of a bulk operation. With an id list, ids that were not
+    affected are reported as missing_status if they exist, else not_found.
+    """
+    results = [{"id": row.id, "part_id": row.part_id, "status": status_name} for row in rows]
+    if ids is not None:
+        affected = {row.id for row in rows}
+        missing = [part_uuid for part_uuid in dict.fromkeys(ids) if part_uuid not in affected]
+        existing = dict(db.query(Part.id, Part.part_id).filter(
+            Part.id == any_(bindparam("missing_ids", missing, type_=ARRAY(PG_UUID(as_uuid=True))))
+        ).all()) if missing else {}
+        results += [
+            {
+                "id": part_uuid,
+                "part_id": existing.get(part_uuid),
+                "status": missing_status if part_uuid in existing else "not_found"
+            }
+            for part_uuid in missing
+        ]
+    return results
+
+
+@router.post("/bulk-update", response_model=PartBulkResult)
+def bulk_update_parts(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: PartBulkUpdateRequest,
+    current_user = Depends(deps.get_current_active_user),
+    request: Request
+) -> Any:
+    """
+    Apply the same changes to many parts at once.
+    Parts are selected by ids or by the parts list filters; the change is one
+    set-based UPDATE ... RETURNING and the audit rows are written in one batch,
+    all in a single transaction. Deleted parts are not updated; listed ids of
+    deleted parts are reported as skipped_deleted.
+    """
+    from app.services.part_bulk import PartBulkService
+    
+    changes = body.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No changes given",
+        )
+    
+    checks = check_part_references(
+        db,
+        mfg_id=changes.get('mfg_id'),
+        part_name_en=changes.get('part_name_en'),
+        position_id=changes.get('position_id')
+    )
+    if checks.mfg_found is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Manufacturer with id '{changes['mfg_id']}' not found",
+        )
+    if checks.translation_found is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part translation '{changes['part_name_en']}' not found",
+        )
+    if checks.position_found is False:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Position with id '{changes['position_id']}' not found",
+        )
+    
+    condition = bulk_target_condition(db, body.ids, body.filter)
+    rows = PartBulkService.update(db, condition, changes, user_id=current_user.id, request=request)
+    db.commit()
+    logger.info(f"{len(rows)} parts bulk updated by user {current_user.username}")
+    
+    return {
+        "affected": len(rows),
+        "results": bulk_item_results(db, body.ids, rows, "updated", "skipped_deleted")
+    }
+
+
+@router.post("/bulk-delete", response_model=PartBulkResult)
+def bulk_delete_parts(
+    *,
+    db: Session = Depends(deps.get_db),
+    body: PartBulkDeleteRequest,
+    current_user = Depends(deps.get_current_active_user),
+    request: Request
+) -> Any:
+    """
+    Soft delete many parts at once, or restore them with restore=true.
+    Parts are selected by ids or by the parts list filters (restore needs ids,
+    since the list filters only match non-deleted parts).
+    """
+    from app.services.part_bulk import PartBulkService
+    
+    if body.restore and body.ids is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Restore requires ids",
+        )
+    
+    condition = bulk_target_condition(db, body.ids, body.filter)
+    rows = PartBulkService.set_deleted(
+        db, condition, deleted=not body.restore, user_id=current_user.id, request=request
+    )
+    db.commit()
+    logger.info(
+        f"{len(rows)} parts bulk {'restored' if body.restore else 'deleted'} by user {current_user.username}"
+    )
+    
+    return {
+        "affected": len(rows),
+        "results": bulk_item_results(
+            db, body.ids, rows, "restored" if body.restore else "deleted", "unchanged"
+        )
+    }
+
+
+@router.get("/template/download")
+def download_parts_template(
+    current_user = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Download CSV template for bulk upload
+    """
+    csv_content = "part_id,mfg_id,part_name_en,position_id,drive_side,designation,moq,weight,width,length,height,note,image_url\n"
+    csv_content += "04465-33450,TOY,Brake Pad,FL,NA,Front brake pad set,4,1.20,15.00,10.00,5.00,,\n"
+    
+    return StreamingResponse(
+        io.StringIO(csv_content),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=parts_template.csv"}
+    )
+
+@router.get("/resolve", response_model=List[PartResponse])
+def resolve_part_number(
+    *,
+    db: Session = Depends(deps.get_db),
+    part_number: str = Query(..., min_length=1, description="Any spelling, e.g. 04465-33450 or 04465 33450"),
+) -> Any:
+    """
+    Resolve a raw supplier part number to parts via the normalized part_id index.
+    Returns every non-deleted part whose normalized part_id matches.
+    """
+    normalized = normalize_part_number(part_number)
+    if not normalized:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Part number contains no letters or digits",
+        )
+    
+    parts = db.query(Part).options(
+        joinedload(Part.manufacturer),
+        joinedload(Part.part_translation),
+        joinedload(Part.position)
+    ).filter(
+        Part.part_id_normalized == normalized,
+        Part.deleted_at.is_(None)
+    ).order_by(Part.part_id).all()
+    
+    return parts
+
+@router.get("/changes", response_model=PartChangesResponse)
+def read_part_changes(
+    *,
+    db: Session = Depends(deps.get_db),
+    since: Optional[str] = Query(None, description="next_cursor from the previous call, or an ISO-8601 timestamp"),
+    limit: int = Query(500, ge=1, le=5000),
+) -> Any:
+    """
+    Incremental change feed for catalog mirrors.
+    Returns parts created, updated or deleted after `since`, in (change_xid, id)
+    order from the ix_parts_change_xid_id index. change_xid is the id of the
+    transaction that last wrote the part; only parts whose transaction id is
+    below the snapshot's xmin are returned, so every transaction that could
+    still commit a lower id has finished and a cursor never skips a row.
+    Parts that were soft deleted or are no longer approved come back as
+    tombstones. Omit `since` for a full sync; an ISO-8601 timestamp starts from
+    the parts updated after it.
+    """
+    from app.models.approval import ApprovalStatus
+    
+    snapshot_xmin = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String), BigInteger)
+    query = db.query(Part).filter(Part.change_xid < snapshot_xmin)
+    
+    if since:
+        values = decode_cursor(since, 2)
+        try:
+            if values is not None:
+                query = query.filter(
+                    tuple_(Part.change_xid, Part.id) > tuple_(int(values[0]), UUID(values[1]))
+                )
+            else:
+                query = query.filter(Part.updated_at > datetime.fromisoformat(since))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid since: expected a change feed cursor or an ISO-8601 timestamp",
+            )
+    
+    rows = query.options(
+        joinedload(Part.manufacturer),
+        joinedload(Part.part_translation),
+        joinedload(Part.position)
+    ).order_by(Part.change_xid, Part.id).limit(limit + 1).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    items = []
+    for part in rows:
+        deleted = part.deleted_at is not None or part.approval_status != ApprovalStatus.APPROVED
+        items.append({
+            "id": part.id,
+            "part_id": part.part_id,
+            "updated_at": part.updated_at,
+            "deleted": deleted,
+            "deleted_at": part.deleted_at,
+            "part": None if deleted else part,
+        })
+    
+    next_cursor = encode_cursor([rows[-1].change_xid, rows[-1].id]) if rows else since
+    return {"items": items, "next_cursor": next_cursor, "has_more": has_more}
+
 @router.get("/{part_id}", response_model=PartResponse)
 def read_part(
     *,
     db: Session = Depends(deps.get_db),
     part_id: str,
+    request: Request,
+    response: Response,
 ) -> Any:
     """
     Get part by ID (UUID).
+    Supports conditional GET: the ETag/Last-Modified cover the part and its
+    manufacturer, translation and position, and are checked with a single
+    primary-key lookup before anything is loaded or serialized.
     """
+    validators = db.query(
+        Part.updated_at,
+        Manufacturer.updated_at,
+        PartTranslationStandardization.updated_at,
+        PositionTranslation.updated_at
+    ).select_from(Part).outerjoin(
+        Manufacturer, Part.mfg_id == Manufacturer.id
+    ).outerjoin(
+        PartTranslationStandardization,
+        Part.part_name_en == PartTranslationStandardization.part_name_en
+    ).outerjoin(
+        PositionTranslation, Part.position_id == PositionTranslation.id
+    ).filter(Part.id == part_id, Part.deleted_at.is_(None)).first()
+    
+    if validators is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Part not found",
+        )
+    
+    last_modified = max(v for v in validators if v is not None)
+    not_modified = conditional_response(request, response, tuple(validators), last_modified)
+    if not_modified is not None:
+        return not_modified
+    
     part = db.query(Part).options(
         joinedload(Part.manufacturer),
         joinedload(Part.part_translation),
@@ -242,32 +1083,30 @@ def update_part(
             detail="Part not found",
         )
     
-    # Validate foreign keys if being updated
+    # Validate foreign keys if being updated (one query)
     update_data = part_in.model_dump(exclude_unset=True)
     
-    if 'mfg_id' in update_data and update_data['mfg_id']:
-        mfg = db.query(Manufacturer).filter(Manufacturer.id == update_data['mfg_id']).first()
-        if not mfg:
+    if any(update_data.get(field) for field in ('mfg_id', 'part_name_en', 'position_id')):
+        checks = check_part_references(
+            db,
+            mfg_id=update_data.get('mfg_id'),
+            part_name_en=update_data.get('part_name_en'),
+            position_id=update_data.get('position_id')
+        )
+        
+        if checks.mfg_found is False:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Manufacturer with id '{update_data['mfg_id']}' not found",
             )
-    
-    if 'part_name_en' in update_data and update_data['part_name_en']:
-        translation = db.query(PartTranslationStandardization).filter(
-            PartTranslationStandardization.part_name_en == update_data['part_name_en']
-        ).first()
-        if not translation:
+        
+        if checks.translation_found is False:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Part translation '{update_data['part_name_en']}' not found",
             )
-    
-    if 'position_id' in update_data and update_data['position_id']:
-        position = db.query(PositionTranslation).filter(
-            PositionTranslation.id == update_data['position_id']
-        ).first()
-        if not position:
+        
+        if checks.position_found is False:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Position with id '{update_data['position_id']}' not found",
@@ -275,16 +1114,22 @@ def update_part(
     
     # Capture old values for audit
     old_values = {field: getattr(part, field) for field in update_data.keys()}
+    qualified = qualifies(part)
     
     # Update fields
     for field, value in update_data.items():
         setattr(part, field, value)
     
     db.add(part)
-    db.commit()
-    db.refresh(part)
+    db.flush()
+    # Re-aggregate (and lock) the name's statistics only when they can change
+    stats_changed = any(
+        old_values[field] != update_data[field] for field in DIMENSION_STATS_FIELDS.intersection(update_data)
+    )
+    if stats_changed and (qualified or qualifies(part)):
+        DimensionStatsService.refresh(db, [old_values.get('part_name_en'), part.part_name_en])
     
-    # Audit log
+    # Audit log, committed together with the update
     log_audit(
         db=db,
         action="UPDATE",
@@ -295,8 +1140,10 @@ def update_part(
             "old": make_json_serializable(old_values),
             "new": make_json_serializable(update_data)
         },
-        request=request
+        request=request,
+        commit=False
     )
+    db.commit()
     logger.info(f"Part {part.part_id} updated by user {current_user.username}")
     
     # Load relationships
@@ -328,11 +1175,14 @@ def delete_part(
     
     # Soft delete using BaseModel's SoftDeleteMixin
     from datetime import datetime
+    qualified = qualifies(part)
     part.deleted_at = datetime.utcnow()
     db.add(part)
-    db.commit()
+    db.flush()
+    if qualified:
+        DimensionStatsService.refresh(db, [part.part_name_en])
     
-    # Audit log
+    # Audit log, committed together with the delete
     log_audit(
         db=db,
         action="DELETE",
@@ -340,8 +1190,10 @@ def delete_part(
         entity_id=str(part.id),
         user_id=current_user.id,
         changes={"old": {"part_id": part.part_id, "designation": part.designation}},
-        request=request
+        request=request,
+        commit=False
     )
+    db.commit()
     logger.info(f"Part {part.part_id} deleted by user {current_user.username}")
     
     return {"message": "Part deleted successfully", "part_id": str(part.id)}
@@ -349,15 +1201,135 @@ def delete_part(
 
 # Part Equivalence Endpoints
 
+@router.post("/equivalences/batch", response_model=PartEquivalenceBatchResponse)
+def batch_part_equivalences(
+    *,
+    db: Session = Depends(deps.get_db),
+    batch_in: PartEquivalenceBatchRequest,
+) -> Any:
+    """
+    Equivalents of many parts in one call.
+    Each entry may be a part UUID or a part_id string. All groups are resolved
+    with a single self-join on equivalence_group_id; every equivalent part's
+    payload is returned once in `parts`, and `equivalences` maps each entry to
+    the ids of its equivalents.
+    """
+    keys = []
+    uuids = []
+    for raw in batch_in.part_ids:
+        key = raw.strip()
+        if not key:
+            continue
+        keys.append(key)
+        try:
+            uuids.append(UUID(key))
+        except ValueError:
+            pass
+    keys = list(dict.fromkeys(keys))
+    
+    source = aliased(Part, name="source")
+    source_key = source.part_id_normalized if batch_in.normalize else source.part_id
+    values = list({normalize_part_number(k) for k in keys} if batch_in.normalize else set(keys))
+    
+    rows = db.query(source.id, source_key.label("source_key"), Part).select_from(source).outerjoin(
+        Part,
+        and_(
+            Part.equivalence_group_id == source.equivalence_group_id,
+            Part.id != source.id,
+            Part.deleted_at.is_(None)
+        )
+    ).options(
+        joinedload(Part.manufacturer),
+        joinedload(Part.part_translation),
+        joinedload(Part.position)
+    ).filter(
+        or_(
+            source_key == any_(bindparam("part_keys", values, type_=ARRAY(String))),
+            source.id == any_(bindparam("part_uuids", uuids, type_=ARRAY(PG_UUID(as_uuid=True))))
+        ),
+        source.deleted_at.is_(None)
+    ).all()
+    
+    equivalents_of = {}  # matched part id -> equivalent part ids
+    sources_by_key = {}  # part key -> matched part ids
+    parts = {}
+    for source_id, key, equivalent in rows:
+        ids = equivalents_of.setdefault(source_id, [])
+        sources = sources_by_key.setdefault(key, [])
+        if source_id not in sources:
+            sources.append(source_id)
+        if equivalent is not None:
+            ids.append(equivalent.id)
+            parts[str(equivalent.id)] = equivalent
+    
+    equivalences = {}
+    missing = []
+    for key in keys:
+        source_ids = sources_by_key.get(normalize_part_number(key) if batch_in.normalize else key)
+        if source_ids is None:
+            try:
+                source_ids = [UUID(key)] if UUID(key) in equivalents_of else None
+            except ValueError:
+                pass
+        if source_ids is None:
+            missing.append(key)
+        else:
+            equivalences[key] = list(dict.fromkeys(
+                part_uuid for source_id in source_ids for part_uuid in equivalents_of[source_id]
+            ))
+    
+    return {"equivalences": equivalences, "parts": parts, "missing": missing}
+
+
+@router.post("/equivalences/check", response_model=PartEquivalenceCheckResult)
+def check_part_equivalences(
+    *,
+    db: Session = Depends(deps.get_db),
+    group_id: Optional[UUID] = Query(None, description="Check the component(s) of this equivalence group"),
+    since: Optional[datetime] = Query(None, description="Check every component touched since this instant (ISO-8601)"),
+    repair: bool = Query(False, description="Rewrite mismatched equivalence_group_id values in place"),
+    request: Request,
+    current_user = Depends(deps.get_current_superuser),
+) -> Any:
+    """
+    Verify stored equivalence groups against the active links, one component
+    at a time, for one group or for everything changed since a timestamp.
+    With repair, each component is fixed and committed on its own.
+    Superusers only.
+    """
+    from app.services.equivalence_check import EquivalenceCheckService
+    
+    if (group_id is None) == (since is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of group_id or since")
+    
+    if group_id is not None:
+        seeds = EquivalenceCheckService.group_seeds(db, group_id)
+    else:
+        seeds = EquivalenceCheckService.changed_seeds(db, since)
+    
+    reports = []
+    for report in EquivalenceCheckService.iter_components(db, seeds, repair=repair):
+        if repair:
+            # Commit per component, which also releases its group locks
+            EquivalenceCheckService.audit_repair(db, report, current_user.id, request)
+            db.commit()
+        reports.append(report)
+    db.rollback()
+    
+    return EquivalenceCheckService.summarize(reports)
+
+
 @router.get("/{part_id}/equivalences", response_model=List[PartEquivalenceResponse])
 def get_part_equivalences(
     *,
     db: Session = Depends(deps.get_db),
     part_id: str,
+    as_of: Optional[datetime] = Query(None, description="Return the equivalences as they were at this instant (ISO-8601)"),
 ) -> Any:
     """
     Get all equivalences for a specific part.
     Uses fast equivalence groups lookup with transitive support.
+    With as_of, the group is rebuilt from the links that were active then.
     """
     part = db.query(Part).filter(Part.id == part_id).first()
     if not part:
@@ -365,7 +1337,10 @@ def get_part_equivalences(
     
     # Use service to get equivalents via group lookup
     from app.services.equivalence_service import EquivalenceService
-    equivalents = EquivalenceService.get_equivalences(db, part.id)
+    if as_of is not None:
+        equivalents = EquivalenceService.get_equivalences_as_of(db, part.id, as_of)
+    else:
+        equivalents = EquivalenceService.get_equivalences(db, part.id)
     
     # Format response
     result = []
@@ -400,6 +1375,9 @@ def create_part_equivalence(
     if not equivalent_part:
         raise HTTPException(status_code=404, detail="Equivalent part not found")
     
+    if equivalent_part.id == part.id:
+        raise HTTPException(status_code=400, detail="A part cannot be equivalent to itself")
+    
     # Use service to create equivalence
     from app.services.equivalence_service import EquivalenceService
     try:
@@ -434,10 +1412,12 @@ def delete_part_equivalence(
     # Use service to delete equivalence
     from app.services.equivalence_service import EquivalenceService
     try:
-        EquivalenceService.delete_equivalence(db, UUID(part_id), UUID(equivalent_part_id), current_user.id)
+        deleted = EquivalenceService.delete_equivalence(db, UUID(part_id), UUID(equivalent_part_id), current_user.id)
     except Exception as e:
         logger.error(f"Failed to delete equivalence: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete equivalence relationship")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Equivalence not found")
     
     logger.info(f"Part equivalence deleted: {part_id} <-> {equivalent_part_id}")
     
@@ -466,150 +1446,100 @@ def bulk_create_equivalences(
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
 
-    created_count = 0
-    skipped_count = 0
-    errors = []
-    auto_created_parts = []
-    
     from app.services.equivalence_service import EquivalenceService
-    from app.models.approval import ApprovalStatus
-    from datetime import datetime
 
-    for target_part_id_raw in target_part_ids:
-        try:
-            # Strip whitespace from part ID
-            target_part_id = target_part_id_raw.strip() if isinstance(target_part_id_raw, str) else target_part_id_raw
-            
-            if not target_part_id:
-                continue
-            
-            # Check if target part exists (by string ID)
-            equivalent_part = db.query(Part).filter(Part.part_id == target_part_id).first()
-            
-            # Auto-create part if it doesn't exist
-            if not equivalent_part:
-                logger.info(f"Auto-creating part {target_part_id} with pending_approval status")
-                equivalent_part = Part(
-                    part_id=target_part_id,
-                    approval_status=ApprovalStatus.PENDING_APPROVAL,
-                    submitted_at=datetime.utcnow()
-                )
-                db.add(equivalent_part)
-                db.flush()  # Get the ID for creating equivalence
-                auto_created_parts.append(target_part_id)
-            
-            # Create equivalence using service (without auto-commit)
-            # We'll handle the commit at the end of the loop
-            from app.services.equivalence_service import EquivalenceService
-            
-            # Check if equivalence already exists to avoid duplicates
-            part_a = db.query(Part).filter(Part.id == part.id).first()
-            part_b = db.query(Part).filter(Part.id == equivalent_part.id).first()
-            
-            group_a = part_a.equivalence_group_id if part_a else None
-            group_b = part_b.equivalence_group_id if part_b else None
-            
-            # If already in same group, skip
-            if group_a and group_b and group_a == group_b:
-                skipped_count += 1
-                continue
-            
-            # Create the relationship without auto-commit
-            EquivalenceService.create_equivalence(db, part.id, equivalent_part.id, current_user.id)
-            created_count += 1
-            
-        except Exception as e:
-            logger.error(f"Error processing part {target_part_id if 'target_part_id' in locals() else target_part_id_raw}: {str(e)}")
-            errors.append(f"{target_part_id if 'target_part_id' in locals() else target_part_id_raw}: {str(e)}")
-            # Continue with next part instead of failing the whole batch
-
-    # Commit all changes (including auto-created parts and equivalences)
+    # Resolve, auto-create and link all targets set-based, in one transaction
     try:
+        result = EquivalenceService.bulk_link(db, part.id, target_part_ids, current_user.id)
         db.commit()
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to commit bulk equivalences: {e}")
         return {
             "created": 0,
-            "skipped": skipped_count,
-            "errors": errors + [f"Transaction commit failed: {str(e)}"],
+            "skipped": 0,
+            "errors": [f"Transaction commit failed: {str(e)}"],
             "auto_created_parts": []
         }
 
-    return {
-        "created": created_count,
-        "skipped": skipped_count,
-        "errors": errors,
-        "auto_created_parts": auto_created_parts
-    }
+    logger.info(f"Bulk equivalences for {part.part_id}: {result['created']} created, {result['skipped']} skipped")
+    return result
 
 
 @router.get("/suggestions/{part_name_en}")
 def get_dimension_suggestions(
     part_name_en: str,
+    limit: int = Query(20, ge=1, le=100, description="Return at most this many suggestions"),
+    length: Optional[Decimal] = Query(None, gt=0),
+    width: Optional[Decimal] = Query(None, gt=0),
+    height: Optional[Decimal] = Query(None, gt=0),
+    weight: Optional[Decimal] = Query(None, gt=0),
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get dimension suggestions for a part based on existing parts with the same part_name_en.
-    Returns all similar parts sorted by volumetric ratio (smallest first).
+    Returns the most compact similar parts sorted by volumetric ratio (smallest first),
+    plus precomputed ratio statistics for the name.
     Volumetric ratio = (length × width × height) / weight
-    """
-    from app.models.approval import ApprovalStatus
-    from decimal import Decimal
     
-    # Query approved parts with matching part_name_en that have valid dimensions
-    parts = db.query(Part).filter(
-        Part.part_name_en == part_name_en,
-        Part.approval_status == ApprovalStatus.APPROVED,
-        Part.deleted_at.is_(None),
-        Part.length.isnot(None),
-        Part.width.isnot(None),
-        Part.height.isnot(None),
-        Part.weight.isnot(None),
-        Part.length > 0,
-        Part.width > 0,
-        Part.height > 0,
-        Part.weight > 0
-    ).options(
-        joinedload(Part.manufacturer)
-    ).all()
-    
-    if not parts:
+    If length, width, height and weight are all given, `outlier` flags whether
+    that ratio is far outside the p10-p90 range of existing parts.
+    """
+    stats = DimensionStatsService.get_stats(db, part_name_en)
+    if not stats:
         return {
             "suggestions": [],
-            "count": 0
+            "count": 0,
+            "recommended": None,
+            "stats": None,
+            "outlier": None
         }
     
-    # Calculate volumetric ratio for each part and prepare response
-    suggestions = []
-    for part in parts:
-        # Convert Decimal to float for calculation
-        length = float(part.length)
-        width = float(part.width)
-        height = float(part.height)
-        weight = float(part.weight)
-        
-        # Calculate volumetric ratio
-        volumetric_ratio = (length * width * height) / weight
-        
-        suggestions.append({
-            "part_id": part.part_id,
-            "designation": part.designation,
-            "manufacturer_name": part.manufacturer.mfg_name if part.manufacturer else None,
-            "length": length,
-            "width": width,
-            "height": height,
-            "weight": weight,
-            "moq": part.moq,
-            "volumetric_ratio": round(volumetric_ratio, 2)
-        })
+    # Read in ratio order from the ix_parts_dimension_ratio partial index,
+    # only the columns the response needs
+    rows = db.execute(
+        select(
+            Part.part_id, Part.designation, Manufacturer.mfg_name,
+            Part.length, Part.width, Part.height, Part.weight, Part.moq,
+            volumetric_ratio_expr().label("ratio")
+        ).outerjoin(
+            Manufacturer, Manufacturer.id == Part.mfg_id
+        ).where(
+            Part.part_name_en == part_name_en,
+            *qualifying_filters()
+        ).order_by(volumetric_ratio_expr(), Part.part_id).limit(limit)
+    ).all()
     
-    # Sort by volumetric ratio (smallest first = most compact)
-    suggestions.sort(key=lambda x: x["volumetric_ratio"])
+    suggestions = [
+        {
+            "part_id": row.part_id,
+            "designation": row.designation,
+            "manufacturer_name": row.mfg_name,
+            "length": float(row.length),
+            "width": float(row.width),
+            "height": float(row.height),
+            "weight": float(row.weight),
+            "moq": row.moq,
+            "volumetric_ratio": round(float(row.ratio), 2)
+        }
+        for row in rows
+    ]
+    
+    outlier = None
+    if None not in (length, width, height, weight):
+        outlier = DimensionStatsService.is_outlier(stats, (length * width * height) / weight)
     
     return {
         "suggestions": suggestions,
-        "count": len(suggestions),
-        "recommended": suggestions[0] if suggestions else None  # First one is recommended
+        "count": stats.part_count,
+        "recommended": suggestions[0] if suggestions else None,  # First one is recommended
+        "stats": {
+            "part_count": stats.part_count,
+            "ratio_p10": float(stats.ratio_p10) if stats.ratio_p10 is not None else None,
+            "ratio_median": float(stats.ratio_median) if stats.ratio_median is not None else None,
+            "ratio_p90": float(stats.ratio_p90) if stats.ratio_p90 is not None else None,
+            "best_part_id": str(stats.best_part_id) if stats.best_part_id else None
+        },
+        "outlier": outlier
     }
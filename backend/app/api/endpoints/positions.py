@@ -1,8 +1,10 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, Request, Response, Query
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.translation import PositionTranslation
+from app.core.http_cache import conditional_response, list_validators
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
 from pydantic import BaseModel, UUID4
 
 router = APIRouter()
@@ -19,12 +21,29 @@ class PositionResponse(BaseModel):
 
 @router.get("/", response_model=List[PositionResponse])
 def read_positions(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (lean mode)"),
 ) -> Any:
     """
     Retrieve all positions for dropdown selection.
     """
-    positions = db.query(PositionTranslation).offset(skip).limit(limit).all()
+    query = db.query(PositionTranslation)
+    
+    # Validate ?fields= first, so a bad value is a 400 rather than a 304
+    sparse_columns = parse_fields(PositionTranslation, PositionResponse, fields)
+    
+    last_modified, count = list_validators(query, PositionTranslation.updated_at)
+    not_modified = conditional_response(request, response, (last_modified, count), last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    if sparse_columns is not None:
+        rows = query.with_entities(*sparse_columns).offset(skip).limit(limit).all()
+        return fields_response(rows_to_items(rows), response)
+    
+    positions = query.offset(skip).limit(limit).all()
     return positions
@@ -2,7 +2,7 @@
 Translation API endpoints for parts translation management
 """
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
@@ -11,6 +11,8 @@ import io
 from uuid import UUID
 
 from app.api import deps
+from app.core.http_cache import conditional_response, list_validators
+from app.core.fieldsets import parse_fields, rows_to_items, fields_response
 from app.models.translation import PartTranslationStandardization
 from app.models.classification import Category, HSCode
 from app.schemas.translation import (
@@ -26,17 +28,22 @@ router = APIRouter()
 
 @router.get("/", response_model=TranslationListResponse)
 async def list_translations(
+    request: Request,
+    response: Response,
     search: str = None,
     category_en: str = None,
     drive_side_specific: str = None,
     page: int = 1,
     page_size: int = 50,
+    fields: str = None,
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
 ):
     """
-    Get list of translations with optional filters
+    Get list of translations with optional filters.
+    fields=part_name_en,part_name_fr returns only those columns (lean mode).
     """
+    sparse_columns = parse_fields(PartTranslationStandardization, TranslationResponse, fields)
     query = db.query(PartTranslationStandardization)
     
     # Apply filters
@@ -55,11 +62,24 @@ async def list_translations(
     if drive_side_specific:
         query = query.filter(PartTranslationStandardization.drive_side_specific == drive_side_specific)
     
-    # Count total
-    total = query.count()
+    # Count total (together with max(updated_at) for conditional requests)
+    last_modified, total = list_validators(query, PartTranslationStandardization.updated_at)
+    not_modified = conditional_response(request, response, (last_modified, total), last_modified)
+    if not_modified is not None:
+        return not_modified
     
     # Paginate
     offset = (page - 1) * page_size
+    if sparse_columns is not None:
+        rows = query.with_entities(*sparse_columns).offset(offset).limit(page_size).all()
+        return fields_response({
+            "items": rows_to_items(rows),
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": (total + page_size - 1) // page_size
+        }, response)
+    
     items = query.offset(offset).limit(page_size).all()
     
     return {
@@ -122,6 +142,8 @@ async def create_translation(
 @router.get("/{translation_id}", response_model=TranslationResponse)
 async def get_translation(
     translation_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
 ):
@@ -138,6 +160,10 @@ async def get_translation(
             detail="Translation not found"
         )
     
+    not_modified = conditional_response(request, response, (translation.updated_at,), translation.updated_at)
+    if not_modified is not None:
+        return not_modified
+    
     return translation
 
 
@@ -15,6 +15,7 @@ def log_audit(
     user_id: Optional[str] = None,
     changes: Optional[Dict[str, Any]] = None,
     request: Optional[Request] = None,
+    commit: bool = True,
 ):
     """
     Create an audit log entry using existing AuditLog model
@@ -27,6 +28,8 @@ def log_audit(
         user_id: UUID of user performing action
         changes: Dict with 'old' and 'new' values
         request: FastAPI request object (for IP/user agent)
+        commit: Commit immediately; pass False to write the audit row in the
+            caller's transaction
     """
     ip_address = None
     user_agent = None
@@ -46,6 +49,7 @@ def log_audit(
     )
     
     db.add(audit_log)
-    db.commit()
+    if commit:
+        db.commit()
     
     return audit_log
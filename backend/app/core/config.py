@@ -40,6 +40,17 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
     
+    # Parts search: minimum pg_trgm similarity for fuzzy matches
+    PARTS_SEARCH_MIN_SIMILARITY: float = 0.3
+    
+    # Parts list facet counts are cached per filter for this many seconds (0 disables)
+    PARTS_FACET_CACHE_TTL: int = 30
+    
+    # In-process union-find index of equivalence groups (see services/equivalence_index.py).
+    # Each worker re-checks the shared version at most every CHECK_INTERVAL seconds.
+    EQUIVALENCE_INDEX_ENABLED: bool = False
+    EQUIVALENCE_INDEX_CHECK_INTERVAL: float = 1.0
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
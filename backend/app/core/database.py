@@ -34,3 +34,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def copy_from_stream(db, copy_sql: str, stream) -> None:
+    """
+    Run a COPY ... FROM STDIN statement on the session's connection.
+    Works with both psycopg2 (copy_expert) and psycopg 3 (cursor.copy).
+    """
+    dbapi_connection = db.connection().connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(copy_sql, stream)
+        else:
+            with cursor.copy(copy_sql) as copy:
+                while True:
+                    chunk = stream.read(65536)
+                    if not chunk:
+                        break
+                    copy.write(chunk)
+    finally:
+        cursor.close()
@@ -0,0 +1,64 @@
+"""
+Sparse fieldsets (?fields=) for list endpoints
+"""
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
+
+# Serializes plain rows (UUID, Decimal, datetime, ...) to JSON without building
+# and validating a response model per item
+_payload_adapter = TypeAdapter(Any)
+
+# Headers set by conditional_response that must survive a direct Response
+_FORWARDED_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+def parse_fields(model, schema, fields: Optional[str], always: Sequence[str] = ("id",)) -> Optional[List[Any]]:
+    """
+    Resolve a comma-separated ?fields= value to the model's column attributes.
+    Returns None when no fields were requested. Only plain columns that the
+    endpoint's response schema exposes are allowed, so a sparse query never
+    joins relationships or reveals columns the full response leaves out.
+    """
+    if not fields:
+        return None
+
+    columns = {
+        attr.key: getattr(model, attr.key)
+        for attr in inspect(model).column_attrs
+        if attr.key in schema.model_fields
+    }
+    requested = list(dict.fromkeys(
+        [name for name in always] + [f.strip() for f in fields.split(",") if f.strip()]
+    ))
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(sorted(columns))}",
+        )
+    return [columns[name] for name in requested]
+
+
+def rows_to_items(rows, keys: Optional[Sequence[str]] = None) -> List[dict]:
+    """Convert column-only result rows to dicts, optionally keeping only `keys`"""
+    if keys is None:
+        return [dict(row._mapping) for row in rows]
+    return [{key: row._mapping[key] for key in keys} for row in rows]
+
+
+def fields_response(payload: Any, response: Optional[Response] = None) -> Response:
+    """
+    Serialize a sparse payload straight to JSON, keeping any cache headers
+    already set on the endpoint's response.
+    """
+    headers = {}
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k in _FORWARDED_HEADERS}
+    return Response(
+        content=_payload_adapter.dump_json(payload),
+        media_type="application/json",
+        headers=headers,
+    )
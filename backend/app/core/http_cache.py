@@ -0,0 +1,92 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read endpoints
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+
+def make_etag(*validators: Any) -> str:
+    """Build a weak ETag from arbitrary validator values"""
+    digest = hashlib.sha1("|".join(str(v) for v in validators).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def list_validators(query: Query, updated_at_column) -> Tuple[Optional[datetime], int]:
+    """
+    Return (max(updated_at), row count) over a filtered query.
+    Pass the query before eager-load options, ordering or pagination are applied.
+    """
+    last_modified, count = query.order_by(None).with_entities(
+        func.max(updated_at_column), func.count()
+    ).one()
+    return last_modified, count
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    validators: Sequence[Any],
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET.
+
+    The ETag covers the path, the query string and the given validators.
+    Returns a 304 response when the client's copy is current; otherwise sets
+    ETag/Last-Modified on `response` and returns None so the caller builds the body.
+    """
+    etag = make_etag(request.url.path, request.url.query, *validators)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and last_modified is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+import base64
+import json
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort-key values of the last row of a page into an opaque cursor.
+    UUIDs and datetimes are stored as strings.
+    """
+    payload = json.dumps([str(v) if v is not None else None for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[List[Optional[str]]]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Returns None if the cursor is malformed or has the wrong number of keys.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """
+    Estimate the number of rows a query returns from the planner's row estimate.
+
+    Runs EXPLAIN instead of COUNT(*) so the cost does not grow with the size of
+    the filtered set. Falls back to pg_class.reltuples for the base table if the
+    query cannot be explained.
+    """
+    statement = query.order_by(None).statement
+    try:
+        compiled = statement.compile(
+            dialect=db.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+    except Exception:
+        compiled = None
+
+    if compiled is not None:
+        # Literal binds are rendered for the driver's paramstyle, so bypass text()
+        plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+    table = statement.get_final_froms()[0]
+    reltuples = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table.name},
+    ).scalar()
+    return max(int(reltuples or 0), 0)
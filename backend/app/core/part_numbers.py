@@ -0,0 +1,18 @@
+"""
+Part number normalization for cross-reference lookups
+"""
+import re
+
+_NON_ALNUM = re.compile(r"[^0-9A-Za-z]")
+
+# SQL twin of normalize_part_number(); used for the generated parts.part_id_normalized
+# column. Both must strip the same characters or lookups will miss.
+NORMALIZED_PART_ID_SQL = "upper(regexp_replace(part_id, '[^0-9A-Za-z]', '', 'g'))"
+
+
+def normalize_part_number(raw: str) -> str:
+    """
+    Normalize a raw part number spelling: drop punctuation/whitespace, uppercase.
+    '04465-33450', '0446533450' and '04465 33450' all become '0446533450'.
+    """
+    return _NON_ALNUM.sub("", raw or "").upper()
@@ -27,6 +27,17 @@ async def lifespan(app: FastAPI):
     logger.info("Starting AidRigs Parts Database API...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Database: Connected")
+    if settings.EQUIVALENCE_INDEX_ENABLED:
+        from app.core.database import SessionLocal
+        from app.services.equivalence_index import equivalence_index
+        db = SessionLocal()
+        try:
+            equivalence_index.load(db)
+        except Exception as e:
+            # Not fatal: the index loads lazily on first use
+            logger.warning(f"Could not load equivalence index at startup: {e}")
+        finally:
+            db.close()
     yield
     # Shutdown
     logger.info("Shutting down AidRigs Parts Database API...")
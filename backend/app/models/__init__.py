@@ -7,7 +7,7 @@ from app.models.rbac import Role, Permission, UserRole, RolePermission
 from app.models.classification import HSCode, HSCodeTariff, Category
 from app.models.translation import PartTranslationStandardization, PositionTranslation
 from app.models.manufacturer import Manufacturer
-from app.models.part import Part
+from app.models.part import Part, PartDimensionStats
 from app.models.vehicle import Vehicle, VehicleEquivalence, VehiclePartCompatibility
 from app.models.supplier import Supplier, SupplierPart, PricingRule
 from app.models.quote import Quote, QuoteItem
@@ -42,6 +42,7 @@ __all__ = [
     # Parts & Manufacturers
     "Manufacturer",
     "Part",
+    "PartDimensionStats",
     
     # Vehicles
     "Vehicle",
@@ -1,15 +1,22 @@
 """
 Part models including main parts and equivalence
 """
-from sqlalchemy import Column, String, Integer, Numeric, Enum, Text, ForeignKey, Table, DateTime
+from sqlalchemy import (
+    Column, String, Integer, BigInteger, Numeric, Enum, Text, ForeignKey, Table, DateTime, Computed,
+    CheckConstraint, Index, text
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 from app.core.database import Base
 from app.models.approval import ApprovalStatus
+from app.core.part_numbers import NORMALIZED_PART_ID_SQL
 
 
-# Association table for parts equivalence
+# Association table for parts equivalence. Each undirected link is stored with
+# part_id < equivalent_part_id, one row per lifetime: a deleted link keeps its
+# row and re-linking adds a new one, so at most one row per pair is active.
+# The parts_equivalence_symmetric view lists both directions.
 parts_equivalence = Table(
     'parts_equivalence',
     Base.metadata,
@@ -19,7 +26,21 @@ parts_equivalence = Table(
     Column('created_at', DateTime, nullable=False),
     Column('created_by', UUID(as_uuid=True), ForeignKey('users.id')),
     Column('deleted_at', DateTime, nullable=True),
-    Column('deleted_by', UUID(as_uuid=True), ForeignKey('users.id'))
+    Column('deleted_by', UUID(as_uuid=True), ForeignKey('users.id')),
+    Index(
+        'uq_parts_equivalence_active', 'part_id', 'equivalent_part_id',
+        unique=True, postgresql_where=text('deleted_at IS NULL')
+    ),
+    CheckConstraint('part_id < equivalent_part_id', name='ck_parts_equivalence_canonical')
+)
+
+# Single-row counter bumped by every equivalence group change; workers compare
+# it with the version their in-memory equivalence index was built from
+equivalence_index_state = Table(
+    'equivalence_index_state',
+    Base.metadata,
+    Column('id', Integer, primary_key=True),
+    Column('version', BigInteger, nullable=False)
 )
 
 
@@ -29,6 +50,8 @@ class Part(BaseModel):
     __tablename__ = "parts"
     
     part_id = Column(String(12), unique=True, nullable=False, index=True)  # Legacy/external part ID
+    # Uppercase, punctuation/whitespace stripped; generated by Postgres on every write
+    part_id_normalized = Column(String(12), Computed(NORMALIZED_PART_ID_SQL, persisted=True), index=True)
     mfg_id = Column(UUID(as_uuid=True), ForeignKey("manufacturers.id"))
     part_name_en = Column(String(60), ForeignKey("part_translation_standardization.part_name_en"))
     position_id = Column(UUID(as_uuid=True), ForeignKey("position_translation.id"))
@@ -59,6 +82,10 @@ class Part(BaseModel):
     # Computed view for fast transitive lookups. Source of truth is parts_equivalence table.
     equivalence_group_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     
+    # Change feed marker: id of the transaction that last wrote the row, set by
+    # the trigger_parts_change_xid trigger (see GET /parts/changes)
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+    
     # Relationships
     manufacturer = relationship("Manufacturer", back_populates="parts")
     part_translation = relationship("PartTranslationStandardization", back_populates="parts")
@@ -84,3 +111,27 @@ class Part(BaseModel):
     
     def __repr__(self):
         return f"<Part({self.part_id}: {self.designation})>"
+
+
+class PartDimensionStats(Base):
+    """
+    Volumetric ratio statistics per part_name_en, over approved parts with
+    complete dimensions. Maintained by DimensionStatsService.refresh.
+    """
+    
+    __tablename__ = "part_dimension_stats"
+    
+    part_name_en = Column(
+        String(60),
+        ForeignKey("part_translation_standardization.part_name_en", ondelete="CASCADE"),
+        primary_key=True
+    )
+    part_count = Column(Integer, nullable=False)
+    ratio_p10 = Column(Numeric(20, 4))
+    ratio_median = Column(Numeric(20, 4))
+    ratio_p90 = Column(Numeric(20, 4))
+    best_part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id", ondelete="SET NULL"))  # Smallest ratio
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<PartDimensionStats({self.part_name_en}: n={self.part_count})>"
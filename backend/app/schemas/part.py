@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, UUID4, Field
 from datetime import datetime
 from decimal import Decimal
@@ -43,6 +43,7 @@ class PartBase(BaseModel):
     height: Optional[Decimal] = Field(None, ge=0)
     note: Optional[str] = None
     image_url: Optional[str] = None
+    part_metadata: Optional[Dict[str, Any]] = None  # Supplier-specific attributes (JSONB)
 
 class PartCreate(PartBase):
     """Schema for creating a new part"""
@@ -71,6 +72,7 @@ class PartUpdate(BaseModel):
     height: Optional[Decimal] = Field(None, ge=0)
     note: Optional[str] = None
     image_url: Optional[str] = None
+    part_metadata: Optional[Dict[str, Any]] = None  # Supplier-specific attributes (JSONB)
 
 class PartResponse(PartBase):
     """Schema for part response with relationships"""
@@ -85,13 +87,100 @@ class PartResponse(PartBase):
     class Config:
         from_attributes = True
 
+class FacetCount(BaseModel):
+    """Number of parts in the filtered set with a given facet value"""
+    value: Optional[str] = None
+    label: Optional[str] = None
+    count: int
+
+class PartListItem(PartResponse):
+    """Part in a list response"""
+    group_member_count: Optional[int] = None  # Matching parts in its equivalence group, with ?collapse=equivalence_group
+
 class PartListResponse(BaseModel):
     """Paginated list response"""
-    items: List[PartResponse]
+    items: List[PartListItem]
     total: int
     page: int
     pages: int
     page_size: int
+    next_cursor: Optional[str] = None  # Set in cursor mode when more rows follow
+    total_is_estimate: bool = False
+    facets: Optional[Dict[str, List[FacetCount]]] = None  # Requested with ?facets=
+
+class PartLookupRequest(BaseModel):
+    """Batch lookup of parts by part_id strings and/or UUIDs"""
+    part_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    normalize: bool = Field(False, description="Match on the normalized part number instead of the exact part_id")
+
+class PartLookupResponse(BaseModel):
+    """Batch lookup result"""
+    items: List[PartResponse]
+    missing: List[str]
+
+class PartImportError(BaseModel):
+    """A rejected row of a parts CSV import"""
+    row: int  # CSV record number, header is row 1
+    line: Optional[int] = None  # File line the record starts on
+    part_id: Optional[str] = None
+    error: str
+
+class PartImportResult(BaseModel):
+    """Result of a parts CSV import"""
+    created: int
+    updated: int
+    restored: int = 0  # Soft-deleted parts brought back (restore_deleted=true)
+    error_count: int
+    errors: List[PartImportError]  # First rejected rows, in file order
+
+class PartBulkFilter(BaseModel):
+    """Selects parts with the same filters as the parts list"""
+    search: Optional[str] = None
+    mfg_id: Optional[UUID4] = None
+    part_name_en: Optional[str] = None
+    drive_side: Optional[str] = Field(None, pattern="^(NA|LHD|RHD)$")
+    metadata: Optional[Dict[str, Any]] = None
+
+class PartBulkUpdateRequest(BaseModel):
+    """Apply the same changes to parts selected by ids or by filter"""
+    ids: Optional[List[UUID4]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[PartBulkFilter] = None
+    changes: PartUpdate
+
+class PartBulkDeleteRequest(BaseModel):
+    """Soft delete (or restore) parts selected by ids or by filter"""
+    ids: Optional[List[UUID4]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[PartBulkFilter] = None
+    restore: bool = False
+
+class PartBulkItemResult(BaseModel):
+    """Outcome for one part of a bulk operation"""
+    id: UUID4
+    part_id: Optional[str] = None
+    status: str  # updated, deleted, restored, unchanged, skipped_deleted, not_found
+
+class PartBulkResult(BaseModel):
+    """Result of a bulk update/delete"""
+    affected: int
+    results: List[PartBulkItemResult]
+
+class PartChange(BaseModel):
+    """
+    One entry of the parts change feed. Tombstones (deleted=True) cover soft
+    deleted parts and parts that left the approved catalog; they carry no part.
+    """
+    id: UUID4
+    part_id: str
+    updated_at: datetime
+    deleted: bool
+    deleted_at: Optional[datetime] = None
+    part: Optional[PartResponse] = None
+
+class PartChangesResponse(BaseModel):
+    """Page of the parts change feed"""
+    items: List[PartChange]
+    next_cursor: Optional[str] = None  # Pass as ?since= to resume; unchanged when there was nothing new
+    has_more: bool
 
 class PartFilter(BaseModel):
     """Filters for parts list"""
@@ -121,6 +210,33 @@ class PartEquivalenceResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class PartEquivalenceBatchRequest(BaseModel):
+    """Equivalents of many parts, given as part UUIDs and/or part_id strings"""
+    part_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    normalize: bool = Field(False, description="Match on the normalized part number instead of the exact part_id")
+
+class PartEquivalenceBatchResponse(BaseModel):
+    """Equivalent part ids per requested key; each part payload appears once in `parts`"""
+    equivalences: Dict[str, List[UUID4]]
+    parts: Dict[str, PartResponse]  # Keyed by part UUID
+    missing: List[str]
+
+class PartEquivalenceMismatch(BaseModel):
+    """A part whose stored equivalence group disagrees with its links"""
+    id: UUID4
+    part_id: Optional[str] = None
+    old_group_id: Optional[UUID4] = None
+    new_group_id: Optional[UUID4] = None
+
+class PartEquivalenceCheckResult(BaseModel):
+    """Outcome of an equivalence consistency check"""
+    components: int
+    parts: int
+    skipped: int  # Components too large to check, see CHECK_MAX_PARTS
+    mismatched: int
+    repaired: int
+    mismatches: List[PartEquivalenceMismatch]  # First 100
+
 class PartEquivalenceBulkCreate(BaseModel):
     """Schema for bulk creating part equivalences"""
     equivalences: List[PartEquivalenceCreate]
@@ -0,0 +1,128 @@
+"""
+Dimension Statistics Service
+Maintains part_dimension_stats: per part_name_en volumetric ratio statistics
+(count, p10/median/p90, best-ratio part) over approved parts with complete
+dimensions. Refreshed incrementally for the part names touched by a write.
+"""
+from typing import Iterable, Optional
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+import logging
+
+from app.models.part import Part, PartDimensionStats
+from app.models.approval import ApprovalStatus
+
+logger = logging.getLogger(__name__)
+
+# Parts that contribute to the statistics. Matches the predicate of the
+# ix_parts_dimension_ratio partial index.
+QUALIFYING_SQL = (
+    "p.approval_status = 'APPROVED' AND p.deleted_at IS NULL "
+    "AND p.length > 0 AND p.width > 0 AND p.height > 0 AND p.weight > 0"
+)
+RATIO_SQL = "(p.length * p.width * p.height) / p.weight"
+
+# Part columns whose changes affect the statistics of the part's name
+DIMENSION_STATS_FIELDS = {"part_name_en", "length", "width", "height", "weight"}
+
+# Fewer parts than this and the spread is not meaningful enough to flag outliers
+MIN_PARTS_FOR_OUTLIERS = 5
+
+
+def volumetric_ratio_expr():
+    """ORM expression for the volumetric ratio; same shape as the index expression"""
+    return Part.length * Part.width * Part.height / Part.weight
+
+
+def qualifying_filters():
+    """ORM filters equivalent to QUALIFYING_SQL"""
+    return (
+        Part.approval_status == ApprovalStatus.APPROVED,
+        Part.deleted_at.is_(None),
+        Part.length > 0,
+        Part.width > 0,
+        Part.height > 0,
+        Part.weight > 0,
+    )
+
+
+def qualifies(part: Part) -> bool:
+    """Whether a loaded part contributes to the statistics (QUALIFYING_SQL in Python)"""
+    return (
+        part.approval_status == ApprovalStatus.APPROVED
+        and part.deleted_at is None
+        and all((getattr(part, field) or 0) > 0 for field in ("length", "width", "height", "weight"))
+    )
+
+
+class DimensionStatsService:
+
+    @staticmethod
+    def refresh(db: Session, part_names: Optional[Iterable[Optional[str]]] = None) -> None:
+        """
+        Recompute statistics for the given part names (all names if None).
+        Caller is responsible for committing the transaction.
+        """
+        if part_names is None:
+            name_filter = ""
+            params = {}
+        else:
+            names = sorted({name for name in part_names if name})
+            if not names:
+                return
+            name_filter = "AND p.part_name_en = ANY(:names)"
+            params = {"names": names}
+
+        # Drop names that no longer have any qualifying part
+        stale_filter = "st.part_name_en = ANY(:names) AND" if params else ""
+        db.execute(text(f"""
+            DELETE FROM part_dimension_stats st
+            WHERE {stale_filter} NOT EXISTS (
+                SELECT 1 FROM parts p
+                WHERE p.part_name_en = st.part_name_en AND {QUALIFYING_SQL}
+            )
+        """), params)
+
+        db.execute(text(f"""
+            INSERT INTO part_dimension_stats (
+                part_name_en, part_count, ratio_p10, ratio_median, ratio_p90, best_part_id, updated_at
+            )
+            SELECT
+                r.part_name_en,
+                count(*),
+                percentile_cont(0.1) WITHIN GROUP (ORDER BY r.ratio),
+                percentile_cont(0.5) WITHIN GROUP (ORDER BY r.ratio),
+                percentile_cont(0.9) WITHIN GROUP (ORDER BY r.ratio),
+                (array_agg(r.id ORDER BY r.ratio, r.part_id))[1],
+                now()
+            FROM (
+                SELECT p.part_name_en, p.id, p.part_id, {RATIO_SQL} AS ratio
+                FROM parts p
+                WHERE p.part_name_en IS NOT NULL AND {QUALIFYING_SQL} {name_filter}
+            ) r
+            GROUP BY r.part_name_en
+            ON CONFLICT (part_name_en) DO UPDATE SET
+                part_count = EXCLUDED.part_count,
+                ratio_p10 = EXCLUDED.ratio_p10,
+                ratio_median = EXCLUDED.ratio_median,
+                ratio_p90 = EXCLUDED.ratio_p90,
+                best_part_id = EXCLUDED.best_part_id,
+                updated_at = EXCLUDED.updated_at
+        """), params)
+
+    @staticmethod
+    def get_stats(db: Session, part_name_en: str) -> Optional[PartDimensionStats]:
+        """Primary-key lookup of the statistics for one part name"""
+        return db.get(PartDimensionStats, part_name_en)
+
+    @staticmethod
+    def is_outlier(stats: PartDimensionStats, ratio: Decimal) -> Optional[bool]:
+        """
+        Whether a volumetric ratio lies outside [p10 - spread, p90 + spread],
+        spread being p90 - p10. None when there are too few parts to judge.
+        """
+        if stats.part_count < MIN_PARTS_FOR_OUTLIERS or stats.ratio_p10 is None:
+            return None
+        spread = stats.ratio_p90 - stats.ratio_p10
+        return ratio < stats.ratio_p10 - spread or ratio > stats.ratio_p90 + spread
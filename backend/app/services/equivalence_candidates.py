@@ -0,0 +1,325 @@
+"""
+Equivalence Candidate Discovery
+Suggests interchangeable parts that are not yet in the same equivalence group:
+- Block on (part_name_en, position_id), streamed in that order
+- Compare length/width/height/weight within each block with NumPy, a chunk
+  of rows against the whole block at a time
+- Drop pairs that could not beat the worst pair kept so far, then score the
+  rest by designation trigram similarity (pg_trgm rules) on sparse trigram
+  vectors, all with NumPy
+- Keep the best pairs in a bounded heap and return them ranked
+
+Only pairs inside one block are ever compared, so the cost follows the block
+sizes rather than the square of the catalog.
+"""
+import heapq
+import re
+from itertools import groupby, islice
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, exists
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.config import settings
+from app.models.approval import ApprovalStatus
+from app.models.part import Part, parts_equivalence
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_FIELDS = ("length", "width", "height", "weight")
+
+# Broadcast comparisons are chunked so one chunk's pair matrix stays around
+# this many cells
+COMPARE_CHUNK_CELLS = 4_000_000
+
+# Trigram probes per similarity batch (pairs times the trigrams of one side)
+SIMILARITY_CHUNK_GRAMS = 4_000_000
+
+# Blocks larger than this are skipped (and logged): the name/position pair is
+# too generic for its parts to be meaningful candidates
+MAX_BLOCK_SIZE = 50000
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: Optional[str]) -> FrozenSet[str]:
+    """Trigram set of a string as pg_trgm builds it (lower-cased words padded '  w ')"""
+    if not value:
+        return frozenset()
+    grams = set()
+    for word in _WORD.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def trigram_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """pg_trgm similarity(): shared trigrams over distinct trigrams"""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class TrigramVectors:
+    """
+    Designation trigram sets of a block as sparse 0/1 vectors: CSR-style
+    trigram ids per row plus the sorted (row, trigram) keys for lookups
+    """
+
+    def __init__(self, designations: List[Optional[str]]):
+        vocabulary: Dict[str, int] = {}
+        ids: List[int] = []
+        counts: List[int] = []
+        for designation in designations:
+            grams = trigrams(designation)
+            ids.extend(vocabulary.setdefault(gram, len(vocabulary)) for gram in grams)
+            counts.append(len(grams))
+        self.width = max(len(vocabulary), 1)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.counts = np.array(counts, dtype=np.int64)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.keys = np.sort(np.repeat(np.arange(len(counts), dtype=np.int64), self.counts) * self.width + self.ids)
+
+    def shared(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Trigrams each (rows[k], cols[k]) pair has in common"""
+        lengths = self.counts[cols]
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(len(rows), dtype=np.int64)
+        pair = np.repeat(np.arange(len(rows)), lengths)
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        probes = rows[pair] * self.width + self.ids[np.repeat(self.starts[cols], lengths) + offsets]
+        found = np.minimum(np.searchsorted(self.keys, probes), len(self.keys) - 1)
+        return np.bincount(pair, weights=self.keys[found] == probes, minlength=len(rows)).astype(np.int64)
+
+    def similarity(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """pg_trgm similarity per pair, 0 where either side has no trigrams"""
+        result = np.zeros(len(rows), dtype=np.float64)
+        if not len(rows):
+            return result
+        # Batch so the expanded probes of one batch stay bounded
+        probes = np.cumsum(self.counts[cols])
+        bounds = np.searchsorted(probes, np.arange(SIMILARITY_CHUNK_GRAMS, probes[-1], SIMILARITY_CHUNK_GRAMS))
+        for batch in np.split(np.arange(len(rows)), bounds):
+            if not len(batch):
+                continue
+            r, c = rows[batch], cols[batch]
+            shared = self.shared(r, c)
+            union = self.counts[r] + self.counts[c] - shared
+            result[batch] = np.divide(shared, union, out=np.zeros(len(batch)), where=union > 0)
+        return result
+
+
+class EquivalenceCandidateService:
+
+    @staticmethod
+    def iter_blocks(
+        db: Session,
+        batch_size: int = 50000,
+        max_size: int = MAX_BLOCK_SIZE
+    ) -> Iterator[Tuple[tuple, int, Optional[List[tuple]]]]:
+        """
+        Stream approved, non-deleted parts with a part name in
+        (part_name_en, position_id) order and yield one
+        ((part_name_en, position_id), size, rows) per block. Blocks of more
+        than max_size parts are counted while streaming past them and come
+        with rows None.
+        """
+        result = db.execute(
+            select(
+                Part.id, Part.part_id, Part.part_name_en, Part.position_id,
+                Part.equivalence_group_id, Part.designation,
+                *[getattr(Part, f) for f in DIMENSION_FIELDS]
+            ).where(
+                Part.deleted_at.is_(None),
+                Part.approval_status == ApprovalStatus.APPROVED,
+                Part.part_name_en.isnot(None)
+            ).order_by(Part.part_name_en, Part.position_id, Part.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for key, block in groupby(result, key=lambda row: (row.part_name_en, row.position_id)):
+            rows = list(islice(block, max_size + 1))
+            if len(rows) > max_size:
+                yield key, len(rows) + sum(1 for _ in block), None
+            else:
+                yield key, len(rows), rows
+
+    @staticmethod
+    def rejected_pairs(db: Session) -> Set[Tuple[UUID, UUID]]:
+        """
+        Links an analyst removed and did not re-create; these pairs are not
+        suggested again
+        """
+        pe = parts_equivalence.c
+        active = parts_equivalence.alias("active")
+        return set(db.execute(
+            select(pe.part_id, pe.equivalent_part_id).where(
+                pe.deleted_at.isnot(None),
+                ~exists().where(
+                    active.c.part_id == pe.part_id,
+                    active.c.equivalent_part_id == pe.equivalent_part_id,
+                    active.c.deleted_at.is_(None)
+                )
+            )
+        ).all())
+
+    @staticmethod
+    def block_candidates(
+        block: List[tuple],
+        rel_tolerance: float,
+        abs_tolerance: float,
+        min_dimensions: int,
+        min_similarity: float,
+        rejected: Set[Tuple[UUID, UUID]],
+        floor: Callable[[], float] = lambda: -1.0
+    ) -> Iterator[Tuple[float, float, float, tuple, tuple]]:
+        """
+        Yield (score, dimension_score, designation_similarity, part, other)
+        for every pair in the block whose known dimensions all match within
+        tolerance, that is not already grouped together and that scores
+        above floor() (the worst pair the caller still keeps).
+        """
+        n = len(block)
+        dims = np.array(
+            [[np.nan if getattr(row, f) is None else float(getattr(row, f)) for f in DIMENSION_FIELDS] for row in block],
+            dtype=np.float64
+        )
+        # Ungrouped parts get a unique negative code so they never match
+        codes: Dict[UUID, int] = {}
+        group_codes = np.array(
+            [codes.setdefault(row.equivalence_group_id, len(codes)) if row.equivalence_group_id else -1 - i
+             for i, row in enumerate(block)],
+            dtype=np.int64
+        )
+        magnitudes = np.abs(dims)
+        vectors: Optional[TrigramVectors] = None
+        chunk = max(1, COMPARE_CHUNK_CELLS // n)
+
+        for start in range(0, n - 1, chunk):
+            stop = min(start + chunk, n - 1)
+            # Rows start..stop against every later part, one dimension at a time
+            mask = np.arange(n - start - 1)[None, :] >= np.arange(stop - start)[:, None]  # j > i
+            mask &= group_codes[start:stop, None] != group_codes[None, start + 1:]
+            known_count = np.zeros(mask.shape, dtype=np.int8)
+            for k in range(len(DIMENSION_FIELDS)):
+                a, b = dims[start:stop, k, None], dims[None, start + 1:, k]
+                diff = np.abs(a - b)
+                scale = np.fmax(magnitudes[start:stop, k, None], magnitudes[None, start + 1:, k])
+                tolerance = np.fmax(abs_tolerance, rel_tolerance * scale)
+                known = ~np.isnan(diff)
+                mask &= (diff <= tolerance) | ~known
+                known_count += known
+            mask &= known_count >= min_dimensions
+
+            rows, cols = np.nonzero(mask)
+            if not len(rows):
+                continue
+            rows += start
+            cols += start + 1
+
+            # Mean relative difference over the dimensions both parts have
+            diff = np.abs(dims[rows] - dims[cols])
+            scale = np.fmax(magnitudes[rows], magnitudes[cols])
+            rel = np.divide(diff, scale, out=np.zeros_like(diff), where=scale > 0)
+            known = ~np.isnan(diff)
+            mean_rel = np.where(known, rel, 0.0).sum(axis=1) / np.maximum(known.sum(axis=1), 1)
+            dimension_scores = 1.0 - mean_rel / rel_tolerance if rel_tolerance > 0 else np.ones(len(rows))
+            dimension_scores = np.maximum(dimension_scores, 0.0)
+
+            # Even an identical designation cannot lift these above the floor
+            keep = (dimension_scores + 1.0) / 2 > floor()
+            rows, cols, dimension_scores = rows[keep], cols[keep], dimension_scores[keep]
+            if not len(rows):
+                continue
+
+            if vectors is None:
+                vectors = TrigramVectors([row.designation for row in block])
+            similarities = vectors.similarity(rows, cols)
+            scores = (dimension_scores + similarities) / 2
+            keep = scores > floor()
+            # Only pairs that both have a designation are held to min_similarity
+            keep &= ~((vectors.counts[rows] > 0) & (vectors.counts[cols] > 0) & (similarities < min_similarity))
+
+            for i, j, score, dimension_score, similarity in zip(
+                rows[keep].tolist(), cols[keep].tolist(), scores[keep].tolist(),
+                dimension_scores[keep].tolist(), similarities[keep].tolist()
+            ):
+                part, other = block[i], block[j]
+                pair = (part.id, other.id) if part.id < other.id else (other.id, part.id)
+                if pair in rejected:
+                    continue
+                yield score, dimension_score, similarity, part, other
+
+    @staticmethod
+    def discover(
+        db: Session,
+        limit: int = 10000,
+        rel_tolerance: float = 0.05,
+        abs_tolerance: float = 0.01,
+        min_dimensions: int = 2,
+        min_similarity: Optional[float] = None,
+        batch_size: int = 50000,
+        progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, object]:
+        """
+        Rank candidate pairs over the whole catalog and return the best
+        `limit` of them, highest score first. The score averages how closely
+        the dimensions match (1 = identical) and designation similarity.
+        Read-only.
+        """
+        if min_similarity is None:
+            min_similarity = settings.PARTS_SEARCH_MIN_SIMILARITY
+        rejected = EquivalenceCandidateService.rejected_pairs(db)
+
+        best: List[tuple] = []
+        seq = 0  # Tie-breaker so the heap never compares rows
+        parts = blocks = skipped = pairs = 0
+        def floor() -> float:
+            return best[0][0] if len(best) >= limit else -1.0
+
+        for (part_name_en, position_id), size, block in EquivalenceCandidateService.iter_blocks(db, batch_size):
+            parts += size
+            blocks += 1
+            if block is None:
+                skipped += 1
+                logger.warning(
+                    f"Candidate discovery skipped block {part_name_en!r}/{position_id} of {size} parts"
+                )
+                continue
+            if size < 2:
+                continue
+            for score, dimension_score, similarity, part, other in EquivalenceCandidateService.block_candidates(
+                block, rel_tolerance, abs_tolerance, min_dimensions, min_similarity, rejected, floor
+            ):
+                pairs += 1
+                seq += 1
+                entry = (score, seq, dimension_score, similarity, part, other)
+                if len(best) < limit:
+                    heapq.heappush(best, entry)
+                elif score > best[0][0]:
+                    heapq.heapreplace(best, entry)
+            if progress and blocks % 1000 == 0:
+                progress(f"{parts:,} parts in {blocks:,} blocks, {pairs:,} candidate pairs")
+
+        candidates = [
+            {
+                "score": round(score, 4),
+                "dimension_score": round(dimension_score, 4),
+                "designation_similarity": round(similarity, 4),
+                "part_name_en": part.part_name_en,
+                "position_id": part.position_id,
+                "id": part.id,
+                "part_id": part.part_id,
+                "designation": part.designation,
+                "equivalent_id": other.id,
+                "equivalent_part_id": other.part_id,
+                "equivalent_designation": other.designation,
+            }
+            for score, _, dimension_score, similarity, part, other in sorted(best, reverse=True)
+        ]
+        logger.info(f"Candidate discovery: {pairs} pairs over {parts} parts in {blocks} blocks")
+        return {"parts": parts, "blocks": blocks, "skipped_blocks": skipped, "pairs": pairs, "candidates": candidates}
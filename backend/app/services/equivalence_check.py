@@ -0,0 +1,279 @@
+"""
+Equivalence Consistency Check
+Verifies parts.equivalence_group_id against the active parts_equivalence links
+one component at a time, so a check costs a few indexed queries per group:
+- Close over links and stored group membership from a set of seed parts
+- Recompute the expected groups with a union-find over that closure only
+- Report parts whose stored group differs, and optionally repair them in place
+
+Seeds come from one group or from everything changed since a timestamp, which
+keeps a periodic check proportional to recent activity. For a full-catalog
+pass use rebuild_equivalence_groups.py.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import select, or_, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from fastapi import Request
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+import logging
+
+from app.models.part import Part, parts_equivalence
+from app.services.equivalence_index import defer_index_invalidate
+from app.services.equivalence_rebuild import UnionFind
+from app.services.equivalence_service import EquivalenceService, lock_links, symmetric_links
+from app.services.part_bulk import write_audit_rows
+
+logger = logging.getLogger(__name__)
+
+# Components larger than this are reported as skipped, not checked
+CHECK_MAX_PARTS = 20000
+
+
+def _uuid_array(name: str, values: Iterable[UUID]):
+    return any_(bindparam(name, list(values), type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+class EquivalenceCheckService:
+
+    @staticmethod
+    def closure(
+        db: Session,
+        seeds: Iterable[UUID],
+        max_parts: int = CHECK_MAX_PARTS
+    ) -> Tuple[Dict[UUID, Optional[UUID]], Set[Tuple[UUID, UUID]], bool]:
+        """
+        Every part reachable from the seeds over active links or a shared
+        stored group id, level by level. Returns (stored group id per part,
+        active links among them, complete); complete is False when the walk
+        stopped at max_parts.
+        """
+        groups: Dict[UUID, Optional[UUID]] = {}
+        edges: Set[Tuple[UUID, UUID]] = set()
+        seen_groups: Set[UUID] = set()
+        frontier = set(seeds)
+
+        while frontier:
+            if len(groups) + len(frontier) > max_parts:
+                return groups, edges, False
+
+            rows = db.execute(
+                select(Part.id, Part.equivalence_group_id).where(Part.id == _uuid_array("frontier", frontier))
+            ).all()
+            groups.update({part_id: None for part_id in frontier})
+            groups.update(dict(rows))
+            new_groups = {group_id for _, group_id in rows if group_id is not None} - seen_groups
+            seen_groups |= new_groups
+
+            links = symmetric_links()
+            neighbours = db.execute(
+                select(links.c.part_id, links.c.equivalent_part_id).where(
+                    links.c.part_id == _uuid_array("frontier", frontier),
+                    links.c.deleted_at.is_(None)
+                )
+            ).all()
+            edges.update((a, b) if a < b else (b, a) for a, b in neighbours)
+            reached = {b for _, b in neighbours}
+
+            if new_groups:
+                members = db.execute(
+                    select(Part.id).where(Part.equivalence_group_id == _uuid_array("groups", new_groups))
+                ).scalars().all()
+                reached.update(members)
+
+            frontier = reached - groups.keys()
+
+        return groups, edges, True
+
+    @staticmethod
+    def expected_groups(
+        groups: Dict[UUID, Optional[UUID]],
+        edges: Set[Tuple[UUID, UUID]]
+    ) -> Dict[UUID, Optional[UUID]]:
+        """
+        Group id each part of a closure should carry: components of 2+ parts
+        keep the stored id most of their members share (the same rule as the
+        full rebuild), singletons get None.
+        """
+        nodes = list(groups)
+        index = {part_id: node for node, part_id in enumerate(nodes)}
+        uf = UnionFind()
+        for _ in nodes:
+            uf.add()
+        for a, b in edges:
+            uf.union(index[a], index[b])
+
+        votes: Counter = Counter()
+        for part_id, group_id in groups.items():
+            root = uf.find(index[part_id])
+            if group_id is not None and uf.size[root] > 1:
+                votes[(root, group_id)] += 1
+        group_ids: Dict[int, UUID] = {}
+        claimed = set()
+        for (root, group_id), _ in sorted(
+            votes.items(), key=lambda item: (-item[1], -uf.size[item[0][0]], str(item[0][1]))
+        ):
+            if root not in group_ids and group_id not in claimed:
+                group_ids[root] = group_id
+                claimed.add(group_id)
+
+        expected = {}
+        for node, part_id in enumerate(nodes):
+            root = uf.find(node)
+            if uf.size[root] > 1 and root not in group_ids:
+                group_ids[root] = uuid4()
+            expected[part_id] = group_ids.get(root)
+        return expected
+
+    @staticmethod
+    def check_component(
+        db: Session,
+        seeds: Iterable[UUID],
+        repair: bool = False,
+        max_parts: int = CHECK_MAX_PARTS
+    ) -> Dict[str, object]:
+        """
+        Check the component(s) containing the seeds. With repair, the groups
+        are locked in one go, re-read and rewritten with a single UPDATE; the
+        caller commits (which also releases the locks).
+        """
+        seeds = set(seeds)
+        groups, edges, complete = EquivalenceCheckService.closure(db, seeds, max_parts)
+        if repair and complete:
+            lock_links(db)
+            while True:
+                # Lock the whole closure at once; if it grew meanwhile, release
+                # and lock the larger one, never adding keys to held ones
+                savepoint = db.begin_nested()
+                locked = set(groups)
+                EquivalenceService.lock_groups(db, list(locked))
+                groups, edges, complete = EquivalenceCheckService.closure(db, seeds, max_parts)
+                if complete and groups.keys() <= locked:
+                    savepoint.commit()
+                    break
+                savepoint.rollback()
+                if not complete:
+                    break
+
+        report = {"parts": list(groups), "complete": complete, "mismatches": [], "repaired": 0}
+        if not complete:
+            logger.warning(f"Equivalence check skipped a component of more than {max_parts} parts")
+            return report
+
+        expected = EquivalenceCheckService.expected_groups(groups, edges)
+        changed = {part_id: new for part_id, new in expected.items() if groups[part_id] != new}
+        if not changed:
+            return report
+
+        part_ids = dict(db.execute(
+            select(Part.id, Part.part_id).where(Part.id == _uuid_array("changed", changed))
+        ).all())
+        report["mismatches"] = [
+            {
+                "id": part_id,
+                "part_id": part_ids.get(part_id),
+                "old_group_id": groups[part_id],
+                "new_group_id": new,
+            }
+            for part_id, new in sorted(changed.items(), key=lambda item: part_ids.get(item[0]) or "")
+        ]
+
+        if repair:
+            result = db.execute(
+                text("""
+                    UPDATE parts SET equivalence_group_id = c.group_id, updated_at = now()
+                    FROM unnest(CAST(:ids AS uuid[]), CAST(:group_ids AS uuid[])) AS c(id, group_id)
+                    WHERE parts.id = c.id
+                """),
+                {"ids": list(changed), "group_ids": list(changed.values())}
+            )
+            report["repaired"] = result.rowcount
+            defer_index_invalidate(db)
+            logger.info(f"Equivalence check repaired {result.rowcount} parts")
+        return report
+
+    @staticmethod
+    def audit_repair(
+        db: Session,
+        report: Dict[str, object],
+        user_id: Optional[UUID] = None,
+        request: Optional[Request] = None
+    ) -> None:
+        """One UPDATE audit row per repaired part; the caller commits"""
+        if not report["repaired"]:
+            return
+        write_audit_rows(db, "UPDATE", [
+            {
+                "entity_id": m["id"],
+                "changes": {
+                    "old": {"equivalence_group_id": m["old_group_id"]},
+                    "new": {"equivalence_group_id": m["new_group_id"]},
+                    "equivalence_check": True,
+                },
+            }
+            for m in report["mismatches"]
+        ], user_id, request)
+
+    @staticmethod
+    def iter_components(
+        db: Session,
+        seeds: Iterable[UUID],
+        repair: bool = False,
+        max_parts: int = CHECK_MAX_PARTS
+    ) -> Iterator[Dict[str, object]]:
+        """
+        Check seeds one component at a time, yielding a report per component.
+        When repairing, commit after each report so locks are held briefly.
+        """
+        pending = list(dict.fromkeys(seeds))
+        done: Set[UUID] = set()
+        for seed in pending:
+            if seed in done:
+                continue
+            report = EquivalenceCheckService.check_component(db, [seed], repair, max_parts)
+            done.update(report["parts"])
+            done.add(seed)
+            yield report
+
+    @staticmethod
+    def group_seeds(db: Session, group_id: UUID) -> List[UUID]:
+        """Parts currently stored in a group"""
+        return db.execute(
+            select(Part.id).where(Part.equivalence_group_id == group_id).order_by(Part.id)
+        ).scalars().all()
+
+    @staticmethod
+    def changed_seeds(db: Session, since: datetime) -> List[UUID]:
+        """
+        Parts touched since a point in time: both ends of links created,
+        reactivated or deleted since then, and grouped parts updated since then
+        """
+        # Link timestamps are naive UTC, parts.updated_at is timezone-aware
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        link_since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        pe = parts_equivalence.c
+        link_changed = or_(pe.created_at >= link_since, pe.deleted_at >= link_since)
+        return db.execute(
+            select(pe.part_id).where(link_changed)
+            .union(select(pe.equivalent_part_id).where(link_changed))
+            .union(select(Part.id).where(Part.updated_at >= since, Part.equivalence_group_id.isnot(None)))
+        ).scalars().all()
+
+    @staticmethod
+    def summarize(reports: Iterable[Dict[str, object]], sample: int = 100) -> Dict[str, object]:
+        """Fold per-component reports into totals and a sample of mismatches"""
+        summary = {"components": 0, "parts": 0, "skipped": 0, "mismatched": 0, "repaired": 0, "mismatches": []}
+        for report in reports:
+            summary["components"] += 1
+            summary["parts"] += len(report["parts"])
+            summary["skipped"] += 0 if report["complete"] else 1
+            summary["mismatched"] += len(report["mismatches"])
+            summary["repaired"] += report["repaired"]
+            room = sample - len(summary["mismatches"])
+            if room > 0:
+                summary["mismatches"].extend(report["mismatches"][:room])
+        return summary
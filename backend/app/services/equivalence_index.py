@@ -0,0 +1,226 @@
+"""
+Equivalence Index
+In-process disjoint-set (union-find) index of part equivalence groups:
+- Loaded from the active rows of parts_equivalence
+- Updated incrementally after each committed equivalence change
+- Invalidated across workers through the equivalence_index_state version
+
+Group lookups and same-group checks are answered in memory in O(α(n)).
+parts.equivalence_group_id stays the persisted projection of the groups.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.config import settings
+from app.models.part import parts_equivalence, equivalence_index_state
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding index updates to apply once the transaction commits
+_PENDING_KEY = "equivalence_index_pending"
+_VERSION_KEY = "equivalence_index_version"
+
+
+class EquivalenceIndex:
+    """
+    Union-find over part ids with union by size and path halving.
+    Each root also keeps its member set, so a whole group is listed without
+    scanning the forest. All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._parent: Dict[UUID, UUID] = {}
+        self._members: Dict[UUID, Set[UUID]] = {}
+        self._lock = threading.RLock()
+        self.version: Optional[int] = None  # Shared version the index reflects; None = not loaded
+        self._checked_at = 0.0
+
+    # -- Disjoint set primitives (caller holds the lock) ------------------
+
+    def _find(self, part_id: UUID) -> Optional[UUID]:
+        parent = self._parent
+        if part_id not in parent:
+            return None
+        while parent[part_id] != part_id:
+            parent[part_id] = parent[parent[part_id]]
+            part_id = parent[part_id]
+        return part_id
+
+    def _union(self, a: UUID, b: UUID) -> None:
+        for part_id in (a, b):
+            if part_id not in self._parent:
+                self._parent[part_id] = part_id
+                self._members[part_id] = {part_id}
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if len(self._members[root_a]) < len(self._members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._members[root_a] |= self._members.pop(root_b)
+
+    def _split(self, components: List[Set[UUID]]) -> None:
+        # Remove the whole group, then re-link each component; singletons drop out
+        for part_id in set().union(*components) if components else set():
+            self._parent.pop(part_id, None)
+            self._members.pop(part_id, None)
+        for component in components:
+            members = list(component)
+            for other in members[1:]:
+                self._union(members[0], other)
+
+    # -- Loading and freshness --------------------------------------------
+
+    def load(self, db: Session) -> None:
+        """Rebuild the index from all active equivalence rows"""
+        version = db.execute(select(equivalence_index_state.c.version)).scalar()
+        edges = db.execute(
+            select(parts_equivalence.c.part_id, parts_equivalence.c.equivalent_part_id).where(
+                parts_equivalence.c.deleted_at.is_(None)
+            )
+        ).all()
+        with self._lock:
+            self._parent = {}
+            self._members = {}
+            for a, b in edges:
+                self._union(a, b)
+            self.version = version
+            self._checked_at = time.monotonic()
+        logger.info(f"Equivalence index loaded: {len(self._parent)} parts in {len(self._members)} groups (version {version})")
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        Load the index if needed, and reload it when another worker changed
+        the groups. The shared version is read at most once per check interval.
+        """
+        if self.version is not None and time.monotonic() - self._checked_at < settings.EQUIVALENCE_INDEX_CHECK_INTERVAL:
+            return
+        if self.version is not None:
+            current = db.execute(select(equivalence_index_state.c.version)).scalar()
+            if current == self.version:
+                self._checked_at = time.monotonic()
+                return
+        self.load(db)
+
+    def invalidate(self) -> None:
+        """Force a reload on next use"""
+        with self._lock:
+            self.version = None
+
+    def _advance(self, version: Optional[int]) -> None:
+        # The update is only complete if it is the next version after ours;
+        # otherwise another worker's change was missed and a reload is due
+        if version is None or self.version is None or version != self.version + 1:
+            self.version = None
+        else:
+            self.version = version
+
+    # -- Queries ----------------------------------------------------------
+
+    def group_members(self, part_id: UUID) -> Set[UUID]:
+        """All parts in the part's group (including itself); empty if ungrouped"""
+        with self._lock:
+            root = self._find(part_id)
+            return set(self._members[root]) if root is not None else set()
+
+    def group_size(self, part_id: UUID) -> int:
+        with self._lock:
+            root = self._find(part_id)
+            return len(self._members[root]) if root is not None else 1
+
+    def same_group(self, a: UUID, b: UUID) -> bool:
+        with self._lock:
+            root_a = self._find(a)
+            return root_a is not None and root_a == self._find(b)
+
+    # -- Incremental maintenance (applied after commit) -------------------
+
+    def union_pairs(self, pairs: Iterable[Tuple[UUID, UUID]]) -> None:
+        with self._lock:
+            for a, b in pairs:
+                self._union(a, b)
+
+    def split(self, components: List[Set[UUID]]) -> None:
+        """Replace one group by its connected components (singletons drop out)"""
+        with self._lock:
+            self._split(components)
+
+    def detach(self, part_ids: Set[UUID]) -> None:
+        """Split part_ids (one connected component) off from the rest of their group"""
+        with self._lock:
+            root = self._find(next(iter(part_ids))) if part_ids else None
+            if root is not None:
+                self._split([self._members[root] - part_ids, set(part_ids)])
+
+    def apply(self, updates: List[Callable[["EquivalenceIndex"], None]], version: Optional[int]) -> None:
+        """Apply one committed transaction's updates, which moved the shared version to `version`"""
+        with self._lock:
+            if self.version is None:
+                return
+            try:
+                for apply in updates:
+                    apply(self)
+            except Exception as e:
+                logger.error(f"Equivalence index update failed, invalidating: {e}")
+                self.version = None
+                return
+            self._advance(version)
+
+
+equivalence_index = EquivalenceIndex()
+
+
+def index_enabled() -> bool:
+    return settings.EQUIVALENCE_INDEX_ENABLED
+
+
+def bump_version(db: Session) -> int:
+    """Increment the shared index version in the caller's transaction"""
+    return db.execute(
+        update(equivalence_index_state)
+        .where(equivalence_index_state.c.id == 1)
+        .values(version=equivalence_index_state.c.version + 1)
+        .returning(equivalence_index_state.c.version)
+    ).scalar()
+
+
+def defer_index_update(db: Session, apply: Callable[[EquivalenceIndex], None]) -> None:
+    """
+    Record a group change: the shared version is bumped when the transaction
+    commits, whatever this process's setting, so workers with the index
+    enabled reload even after writes from processes without it (CLI scripts).
+    The local index update itself only runs when the index is enabled here.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(apply)
+
+
+def defer_index_invalidate(db: Session) -> None:
+    """Drop the local index after commit (for bulk changes)"""
+    defer_index_update(db, EquivalenceIndex.invalidate)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_pending(session: Session) -> None:
+    # Bumped at commit time, once per transaction, so the version row is
+    # locked only while committing and does not serialize group changes
+    if session.info.get(_PENDING_KEY):
+        session.info[_VERSION_KEY] = bump_version(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    updates = session.info.pop(_PENDING_KEY, None)
+    version = session.info.pop(_VERSION_KEY, None)
+    if updates and index_enabled():
+        equivalence_index.apply(updates, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_VERSION_KEY, None)
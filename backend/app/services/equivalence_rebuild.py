@@ -0,0 +1,232 @@
+"""
+Equivalence Group Rebuild
+Recomputes parts.equivalence_group_id from parts_equivalence for the whole catalog:
+- Stream active links through a server-side cursor
+- Connected components with an array-based union-find
+- COPY (part_id, group_id) into a temporary table
+- Apply every change with a single UPDATE ... FROM
+
+The whole rebuild holds the links lock exclusively (see lock_links), so no
+link, unlink or repair can slip in between reading the links and writing the
+groups.
+
+Existing group ids are kept where a component still matches its old group, so
+a rebuild of a consistent catalog changes nothing.
+"""
+import tempfile
+from array import array
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+import logging
+
+from app.core.database import copy_from_stream
+from app.models.part import Part, parts_equivalence
+from app.services.equivalence_index import defer_index_invalidate
+from app.services.equivalence_service import lock_links
+
+logger = logging.getLogger(__name__)
+
+STAGE_TABLE = "equivalence_group_rebuild"
+
+# Rows of parts whose stored group differs from the rebuilt one
+_DIFF_SQL = f"""
+    SELECT p.id, p.part_id, p.equivalence_group_id AS old_group_id, r.group_id AS new_group_id
+    FROM parts p
+    LEFT JOIN {STAGE_TABLE} r ON r.part_id = p.id
+    WHERE (p.equivalence_group_id IS NOT NULL OR r.group_id IS NOT NULL)
+      AND p.equivalence_group_id IS DISTINCT FROM r.group_id
+"""
+
+
+class UnionFind:
+    """Union-find over dense integer ids backed by typed arrays"""
+
+    def __init__(self):
+        self.parent = array("q")
+        self.size = array("q")
+
+    def add(self) -> int:
+        node = len(self.parent)
+        self.parent.append(node)
+        self.size.append(1)
+        return node
+
+    def find(self, node: int) -> int:
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+
+class EquivalenceRebuildService:
+
+    @staticmethod
+    def compute_components(
+        db: Session,
+        batch_size: int = 50000,
+        progress: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Stream the active links and union their endpoints.
+        Returns (part ids by dense id, union-find).
+        """
+        ids: Dict[UUID, int] = {}
+        nodes: List[UUID] = []
+        uf = UnionFind()
+
+        def node_of(part_id: UUID) -> int:
+            node = ids.get(part_id)
+            if node is None:
+                node = ids[part_id] = uf.add()
+                nodes.append(part_id)
+            return node
+
+        result = db.execute(
+            select(parts_equivalence.c.part_id, parts_equivalence.c.equivalent_part_id)
+            .where(parts_equivalence.c.deleted_at.is_(None))
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        streamed = 0
+        for batch in result.partitions():
+            for part_id, equivalent_part_id in batch:
+                uf.union(node_of(part_id), node_of(equivalent_part_id))
+            streamed += len(batch)
+            if progress:
+                progress(f"streamed {streamed:,} links, {len(nodes):,} parts")
+        return nodes, uf
+
+    @staticmethod
+    def assign_group_ids(
+        db: Session,
+        nodes: List[UUID],
+        uf: UnionFind,
+        batch_size: int = 50000
+    ) -> Dict[int, UUID]:
+        """
+        Pick a group id per component of 2+ parts. A component reuses the old
+        group id most of its members carry, unless a larger component already
+        claimed it; otherwise it gets a new id.
+        """
+        index = {part_id: node for node, part_id in enumerate(nodes)}
+        votes: Counter = Counter()
+        result = db.execute(
+            select(Part.id, Part.equivalence_group_id)
+            .where(Part.equivalence_group_id.isnot(None))
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for batch in result.partitions():
+            for part_id, group_id in batch:
+                node = index.get(part_id)
+                if node is not None:
+                    votes[(uf.find(node), group_id)] += 1
+
+        group_ids: Dict[int, UUID] = {}
+        claimed = set()
+        for (root, group_id), _ in sorted(
+            votes.items(), key=lambda item: (-item[1], -uf.size[item[0][0]], str(item[0][1]))
+        ):
+            if root not in group_ids and group_id not in claimed:
+                group_ids[root] = group_id
+                claimed.add(group_id)
+
+        for node in range(len(nodes)):
+            root = uf.find(node)
+            if uf.size[root] > 1 and root not in group_ids:
+                group_ids[root] = uuid4()
+        return group_ids
+
+    @staticmethod
+    def stage(db: Session, nodes: List[UUID], uf: UnionFind, group_ids: Dict[int, UUID]) -> int:
+        """COPY (part_id, group_id) for every grouped part into the staging table"""
+        db.execute(text(f"""
+            CREATE TEMP TABLE {STAGE_TABLE} (
+                part_id UUID PRIMARY KEY,
+                group_id UUID NOT NULL
+            ) ON COMMIT DROP
+        """))
+        staged = 0
+        with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024, mode="w+") as buffer:
+            for node, part_id in enumerate(nodes):
+                group_id = group_ids.get(uf.find(node))
+                if group_id is not None:
+                    buffer.write(f"{part_id}\t{group_id}\n")
+                    staged += 1
+            buffer.seek(0)
+            copy_from_stream(db, f"COPY {STAGE_TABLE} (part_id, group_id) FROM STDIN", buffer)
+        db.execute(text(f"ANALYZE {STAGE_TABLE}"))
+        return staged
+
+    @staticmethod
+    def diff(db: Session, limit: int = 20) -> Dict[str, object]:
+        """Summarize how the staged groups differ from parts.equivalence_group_id"""
+        counts = db.execute(text(f"""
+            SELECT count(*) AS changed,
+                   count(*) FILTER (WHERE d.old_group_id IS NULL) AS grouped,
+                   count(*) FILTER (WHERE d.new_group_id IS NULL) AS ungrouped
+            FROM ({_DIFF_SQL}) d
+        """)).one()
+        sample = db.execute(text(f"{_DIFF_SQL} ORDER BY p.part_id LIMIT :limit"), {"limit": limit}).all()
+        return {
+            "changed": counts.changed,
+            "grouped": counts.grouped,
+            "ungrouped": counts.ungrouped,
+            "moved": counts.changed - counts.grouped - counts.ungrouped,
+            "sample": [dict(row._mapping) for row in sample],
+        }
+
+    @staticmethod
+    def apply(db: Session) -> int:
+        """Write the staged groups with one UPDATE ... FROM; returns rows changed"""
+        result = db.execute(text(f"""
+            UPDATE parts SET equivalence_group_id = d.new_group_id, updated_at = now()
+            FROM ({_DIFF_SQL}) d
+            WHERE parts.id = d.id
+        """))
+        defer_index_invalidate(db)
+        return result.rowcount
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        dry_run: bool = False,
+        batch_size: int = 50000,
+        progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, object]:
+        """
+        Full rebuild. In dry-run mode nothing is written and the transaction
+        is rolled back; otherwise the caller commits.
+        """
+        say = progress or (lambda message: None)
+
+        # Waits for in-flight link/unlink transactions, blocks new ones until commit
+        lock_links(db, exclusive=True)
+        nodes, uf = EquivalenceRebuildService.compute_components(db, batch_size, progress)
+        group_ids = EquivalenceRebuildService.assign_group_ids(db, nodes, uf, batch_size)
+        say(f"{len(group_ids):,} groups over {len(nodes):,} linked parts")
+
+        staged = EquivalenceRebuildService.stage(db, nodes, uf, group_ids)
+        say(f"staged {staged:,} group assignments")
+
+        summary = EquivalenceRebuildService.diff(db)
+        summary.update({"parts": len(nodes), "groups": len(group_ids), "dry_run": dry_run})
+        if dry_run:
+            db.rollback()
+            return summary
+
+        summary["updated"] = EquivalenceRebuildService.apply(db)
+        say(f"updated {summary['updated']:,} parts")
+        return summary
@@ -5,42 +5,169 @@ Handles business logic for part equivalences, including:
 - Transitive equivalence via groups
 - Group merging and splitting
 - Audit logging
+- Optional in-memory union-find index (see equivalence_index.py)
+- Per-group advisory locks so concurrent merges cannot split a component
+- A catalog-wide links lock, shared by writers and exclusive for the full rebuild
 """
 from typing import List, Optional, Set, Tuple
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import select, insert, update, delete, and_, or_, func
+from sqlalchemy import select, update, delete, and_, or_, func, any_, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert, UUID as PG_UUID
 from sqlalchemy.sql import text
 import logging
 
 from app.models.part import Part, parts_equivalence
+from app.models.approval import ApprovalStatus
 from app.models.user import User
+from app.services.equivalence_index import (
+    equivalence_index, index_enabled, defer_index_update
+)
 
 logger = logging.getLogger(__name__)
 
+def canonical_pair(a: UUID, b: UUID) -> Tuple[UUID, UUID]:
+    """
+    Storage order of a link: parts_equivalence keeps each undirected link once,
+    with part_id < equivalent_part_id (Python and Postgres order UUIDs alike)
+    """
+    return (a, b) if a < b else (b, a)
+
+
+def link_filter(a: UUID, b: UUID):
+    """WHERE clause matching the stored row of the link between a and b"""
+    low, high = canonical_pair(a, b)
+    return and_(parts_equivalence.c.part_id == low, parts_equivalence.c.equivalent_part_id == high)
+
+
+def symmetric_links():
+    """
+    Both directions of every stored link as (part_id, equivalent_part_id, deleted_at);
+    the same shape as the parts_equivalence_symmetric view
+    """
+    pe = parts_equivalence.c
+    return select(pe.part_id, pe.equivalent_part_id, pe.deleted_at).union_all(
+        select(pe.equivalent_part_id, pe.part_id, pe.deleted_at)
+    ).subquery("links")
+
+
+def advisory_lock_key(value: UUID) -> int:
+    """Signed 64-bit pg_advisory lock key for a group (or ungrouped part) id"""
+    return int.from_bytes(value.bytes[:8], "big", signed=True)
+
+
+# Two-key advisory locks live apart from the single-key group locks
+LINKS_LOCK_CLASS = 0x45515649  # "EQVI"
+
+
+def lock_links(db: Session, exclusive: bool = False) -> None:
+    """
+    Transaction-scoped catalog-wide lock on the equivalence links. Link,
+    unlink and repair take it shared before any other equivalence lock, so
+    they still run in parallel; the full rebuild takes it exclusive and so
+    sees no link or group change between reading the links and writing.
+    """
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    db.execute(text(f"SELECT {function}(:lock_class, 0)"), {"lock_class": LINKS_LOCK_CLASS})
+
+
+# Link rows per multi-row INSERT (5 bind parameters each, well under the
+# 65535 parameter limit)
+EDGE_INSERT_BATCH_SIZE = 5000
+
+# Upper bound on the parts a point-in-time component traversal may visit
+AS_OF_MAX_PARTS = 10000
+
+# Component of a part over the links active at :as_of. UNION drops parts
+# already reached, so each part is expanded once; the outer LIMIT stops the
+# recursion early. Each step is an index-only scan on
+# (part_id | equivalent_part_id, created_at, deleted_at) INCLUDE (the other end).
+AS_OF_COMPONENT_SQL = """
+    WITH RECURSIVE component(part_id) AS (
+        SELECT CAST(:part_id AS uuid)
+        UNION
+        SELECT l.equivalent_part_id
+        FROM component c
+        JOIN parts_equivalence_symmetric l ON l.part_id = c.part_id
+        WHERE l.created_at <= :as_of
+          AND (l.deleted_at IS NULL OR l.deleted_at > :as_of)
+    )
+    SELECT part_id FROM component LIMIT :limit
+"""
+
 class EquivalenceService:
     
     @staticmethod
     def get_equivalences(db: Session, part_id: UUID) -> List[Part]:
         """
         Get all equivalent parts for a given part ID.
-        Uses the fast equivalence_group_id lookup.
+        With the in-memory index the group members come from memory; otherwise
+        the equivalence_group_id lookup runs as a single query.
         """
-        # 1. Get the part's group ID
-        part = db.query(Part).filter(Part.id == part_id).first()
-        if not part or not part.equivalence_group_id:
-            return []
-            
-        # 2. Query all parts in the same group (excluding self)
+        if index_enabled():
+            equivalence_index.ensure_fresh(db)
+            member_ids = equivalence_index.group_members(part_id) - {part_id}
+            if not member_ids:
+                return []
+            return db.query(Part).filter(
+                Part.id.in_(member_ids),
+                Part.deleted_at.is_(None)
+            ).all()
+        
+        group_id = select(Part.equivalence_group_id).where(Part.id == part_id).scalar_subquery()
         equivalents = db.query(Part).filter(
-            Part.equivalence_group_id == part.equivalence_group_id,
+            Part.equivalence_group_id == group_id,
             Part.id != part_id,
             Part.deleted_at.is_(None)
         ).all()
         
         return equivalents
 
+    @staticmethod
+    def get_equivalences_as_of(db: Session, part_id: UUID, as_of: datetime) -> List[Part]:
+        """
+        Get the parts that were equivalent to a part at a past instant.
+        The component is rebuilt from the links active at `as_of` (created
+        before it and not yet deleted), and only parts that existed then are
+        returned. Every lifetime of a link is its own row, so links that were
+        deleted and re-created are seen as they were at that instant.
+        """
+        if as_of.tzinfo is not None:
+            as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        member_ids = db.execute(
+            text(AS_OF_COMPONENT_SQL),
+            {"part_id": part_id, "as_of": as_of, "limit": AS_OF_MAX_PARTS + 1}
+        ).scalars().all()
+        if len(member_ids) > AS_OF_MAX_PARTS:
+            logger.warning(f"Point-in-time component of {part_id} truncated at {AS_OF_MAX_PARTS} parts")
+            member_ids = member_ids[:AS_OF_MAX_PARTS]
+        
+        member_ids = [m for m in member_ids if m != part_id]
+        if not member_ids:
+            return []
+        
+        as_of_utc = as_of.replace(tzinfo=timezone.utc)
+        return db.query(Part).filter(
+            Part.id.in_(member_ids),
+            Part.created_at <= as_of_utc,
+            or_(Part.deleted_at.is_(None), Part.deleted_at > as_of_utc)
+        ).all()
+
+    @staticmethod
+    def same_group(db: Session, part_id: UUID, other_part_id: UUID) -> bool:
+        """Whether two parts are (transitively) equivalent"""
+        if index_enabled():
+            equivalence_index.ensure_fresh(db)
+            return equivalence_index.same_group(part_id, other_part_id)
+        
+        groups = dict(db.query(Part.id, Part.equivalence_group_id).filter(
+            Part.id.in_([part_id, other_part_id])
+        ).all())
+        group_id = groups.get(part_id)
+        return group_id is not None and group_id == groups.get(other_part_id)
+
     @staticmethod
     def create_equivalence(
         db: Session, 
@@ -52,96 +179,70 @@ class EquivalenceService:
         Create a new equivalence relationship.
         Updates both source of truth and computed groups.
         """
-        # 1. Check if relationship already exists (including soft-deleted)
-        existing = db.execute(
-            select(parts_equivalence).where(
-                or_(
-                    and_(
-                        parts_equivalence.c.part_id == part_id,
-                        parts_equivalence.c.equivalent_part_id == equivalent_part_id
-                    ),
-                    and_(
-                        parts_equivalence.c.part_id == equivalent_part_id,
-                        parts_equivalence.c.equivalent_part_id == part_id
-                    )
-                )
-            )
-        ).first()
+        # 1. Lock both groups before writing any link row, the same order as
+        # bulk_link, so the two can never wait on each other
+        lock_links(db)
+        groups = EquivalenceService.lock_groups(db, [part_id, equivalent_part_id])
 
-        if existing:
-            if existing.deleted_at is None:
-                # Already exists and active
-                return
-            else:
-                # Reactivate soft-deleted relationship
-                db.execute(
-                    update(parts_equivalence).where(
-                        or_(
-                            and_(
-                                parts_equivalence.c.part_id == part_id,
-                                parts_equivalence.c.equivalent_part_id == equivalent_part_id
-                            ),
-                            and_(
-                                parts_equivalence.c.part_id == equivalent_part_id,
-                                parts_equivalence.c.equivalent_part_id == part_id
-                            )
-                        )
-                    ).values(
-                        deleted_at=None,
-                        deleted_by=None,
-                        created_at=datetime.utcnow(), 
-                        created_by=user_id
-                    )
-                )
-        else:
-            # Create new relationship (Trigger will handle reverse)
-            db.execute(
-                insert(parts_equivalence).values(
-                    id=uuid4(),
-                    part_id=part_id,
-                    equivalent_part_id=equivalent_part_id,
-                    created_at=datetime.utcnow(),
-                    created_by=user_id
-                )
-            )
-        
-        # 2. Update Groups
-        part_a = db.query(Part).filter(Part.id == part_id).first()
-        part_b = db.query(Part).filter(Part.id == equivalent_part_id).first()
+        # 2. Insert the link. A deleted link keeps its row as history, so
+        # re-linking adds a new one; nothing comes back when the link is
+        # already active.
+        low, high = canonical_pair(part_id, equivalent_part_id)
+        linked = db.execute(
+            pg_insert(parts_equivalence).values(
+                id=uuid4(),
+                part_id=low,
+                equivalent_part_id=high,
+                created_at=datetime.utcnow(),
+                created_by=user_id
+            ).on_conflict_do_nothing(
+                index_elements=["part_id", "equivalent_part_id"],
+                index_where=parts_equivalence.c.deleted_at.is_(None)
+            ).returning(parts_equivalence.c.id)
+        ).first()
+        if linked is None:
+            # Already exists and active
+            return
         
-        if not part_a or not part_b:
+        # 3. Update Groups, holding the locks of both groups
+        if part_id not in groups or equivalent_part_id not in groups:
             logger.error(f"Failed to find parts for group update: {part_id}, {equivalent_part_id}")
             return
 
-        group_a = part_a.equivalence_group_id
-        group_b = part_b.equivalence_group_id
+        group_a = groups[part_id]
+        group_b = groups[equivalent_part_id]
         
         logger.info(f"Updating groups for {part_id} (Group: {group_a}) and {equivalent_part_id} (Group: {group_b})")
         
         if group_a is None and group_b is None:
             # Case 1: Neither has group -> Create new
             new_group_id = uuid4()
-            part_a.equivalence_group_id = new_group_id
-            part_b.equivalence_group_id = new_group_id
-            db.add(part_a)
-            db.add(part_b)
+            db.execute(
+                update(Part).where(Part.id.in_([part_id, equivalent_part_id])).values(
+                    equivalence_group_id=new_group_id
+                )
+            )
             logger.info(f"Created new group {new_group_id} for both parts")
             
         elif group_a is not None and group_b is None:
             # Case 2: A has group, B doesn't -> Add B to A's group
-            part_b.equivalence_group_id = group_a
-            db.add(part_b)
+            db.execute(
+                update(Part).where(Part.id == equivalent_part_id).values(equivalence_group_id=group_a)
+            )
             logger.info(f"Added part B to group {group_a}")
             
         elif group_a is None and group_b is not None:
             # Case 3: B has group, A doesn't -> Add A to B's group
-            part_a.equivalence_group_id = group_b
-            db.add(part_a)
+            db.execute(
+                update(Part).where(Part.id == part_id).values(equivalence_group_id=group_b)
+            )
             logger.info(f"Added part A to group {group_b}")
             
         elif group_a != group_b:
             # Case 4: Different groups -> Merge
-            # Move all parts from group_b to group_a
+            # Rewrite only the smaller group (union by size)
+            if EquivalenceService._group_size(db, part_id, group_a) < EquivalenceService._group_size(db, equivalent_part_id, group_b):
+                group_a, group_b = group_b, group_a
             db.execute(
                 update(Part).where(
                     Part.equivalence_group_id == group_b
@@ -151,111 +252,302 @@ class EquivalenceService:
             )
             logger.info(f"Merged group {group_b} into {group_a}")
         
+        defer_index_update(
+            db, lambda index: index.union_pairs([(part_id, equivalent_part_id)])
+        )
+        
         # Note: Caller is responsible for committing the transaction
 
+    @staticmethod
+    def lock_groups(db: Session, part_ids: List[UUID]) -> dict:
+        """
+        Take transaction-scoped advisory locks on the groups of the given parts
+        (on the part itself while it has no group), in ascending key order, so
+        concurrent linkers touching the same groups queue up instead of
+        interleaving, while unrelated groups proceed in parallel.
+        
+        A part may change group between reading and locking, so the groups
+        are re-read under the locks. Keys only ever get taken as one sorted
+        set: when the re-read needs a new key, the round is rolled back to its
+        savepoint (releasing its locks) and the whole, larger set is taken
+        again in order, so two callers can never wait on each other's keys.
+        Returns the parts' group ids as seen under the locks (missing parts
+        are absent). Every writer of equivalence_group_id must hold these
+        locks, taken after lock_links(), and take them once per transaction.
+        """
+        def read_groups() -> dict:
+            return dict(db.execute(
+                select(Part.id, Part.equivalence_group_id).where(
+                    Part.id == any_(bindparam("lock_parts", list(part_ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+                )
+            ).all())
+
+        def keys_of(groups: dict) -> Set[int]:
+            return {advisory_lock_key(groups.get(pid) or pid) for pid in part_ids}
+
+        keys = keys_of(read_groups())
+        while True:
+            savepoint = db.begin_nested()
+            db.execute(
+                text("""
+                    SELECT count(pg_advisory_xact_lock(k))
+                    FROM (SELECT DISTINCT k FROM unnest(CAST(:keys AS bigint[])) AS k ORDER BY k) ordered
+                """),
+                {"keys": sorted(keys)}
+            )
+            groups = read_groups()
+            missing = keys_of(groups) - keys
+            if not missing:
+                savepoint.commit()
+                return groups
+            savepoint.rollback()
+            keys |= missing
+
+    @staticmethod
+    def bulk_link(
+        db: Session,
+        source_id: UUID,
+        target_part_ids: List[str],
+        user_id: UUID
+    ) -> dict:
+        """
+        Link one part to many parts given by part_id strings, set-based:
+        targets are resolved in one query, missing ones are inserted as pending
+        parts in one statement, all edges are inserted with one
+        INSERT ... ON CONFLICT DO NOTHING and the affected groups are merged once.
+        Caller is responsible for committing the transaction.
+        """
+        errors = []
+        wanted = []
+        for raw in target_part_ids:
+            target = raw.strip() if isinstance(raw, str) else raw
+            if not target:
+                continue
+            if not isinstance(target, str) or len(target) > 12:
+                errors.append(f"{target}: invalid part_id (max 12 characters)")
+                continue
+            wanted.append(target)
+        wanted = list(dict.fromkeys(wanted))
+        lock_links(db)
+        
+        # 1. Resolve all targets in one query
+        resolved = {
+            row.part_id: row for row in db.execute(
+                select(Part.id, Part.part_id, Part.equivalence_group_id).where(
+                    Part.part_id == any_(bindparam("target_ids", wanted, type_=ARRAY(String)))
+                )
+            ).all()
+        } if wanted else {}
+        
+        # 2. Insert missing targets as pending parts in one statement
+        missing = [t for t in wanted if t not in resolved]
+        auto_created = []
+        if missing:
+            now = datetime.utcnow()
+            created_rows = db.execute(
+                pg_insert(Part).on_conflict_do_nothing(index_elements=["part_id"]).returning(
+                    Part.id, Part.part_id, Part.equivalence_group_id
+                ),
+                [
+                    {
+                        "part_id": target,
+                        "approval_status": ApprovalStatus.PENDING_APPROVAL,
+                        "submitted_at": now,
+                    }
+                    for target in missing
+                ]
+            ).all()
+            for row in created_rows:
+                resolved[row.part_id] = row
+                auto_created.append(row.part_id)
+            # Created concurrently by another request after step 1
+            raced = [t for t in missing if t not in resolved]
+            if raced:
+                for row in db.execute(
+                    select(Part.id, Part.part_id, Part.equivalence_group_id).where(Part.part_id.in_(raced))
+                ).all():
+                    resolved[row.part_id] = row
+            logger.info(f"Auto-created {len(auto_created)} pending parts for equivalences")
+        
+        # 3. Lock all involved groups, then skip targets already equivalent to the source
+        groups = EquivalenceService.lock_groups(db, [source_id, *[resolved[t].id for t in wanted]])
+        source_group = groups.get(source_id)
+        targets = []
+        skipped = 0
+        for target in wanted:
+            row = resolved[target]
+            if row.id == source_id or (source_group is not None and groups.get(row.id) == source_group):
+                skipped += 1
+            else:
+                targets.append(row)
+        
+        if not targets:
+            return {"created": 0, "skipped": skipped, "errors": errors, "auto_created_parts": auto_created}
+        
+        # 4. Insert every link once (canonical order); links deleted earlier
+        # stay as history rows next to the new ones
+        now = datetime.utcnow()
+        edge_rows = []
+        for row in targets:
+            low, high = canonical_pair(source_id, row.id)
+            edge_rows.append({
+                "id": uuid4(), "part_id": low, "equivalent_part_id": high,
+                "created_at": now, "created_by": user_id,
+            })
+        created = 0
+        for start in range(0, len(edge_rows), EDGE_INSERT_BATCH_SIZE):
+            created += db.execute(
+                pg_insert(parts_equivalence).values(
+                    edge_rows[start:start + EDGE_INSERT_BATCH_SIZE]
+                ).on_conflict_do_nothing(
+                    index_elements=["part_id", "equivalent_part_id"],
+                    index_where=parts_equivalence.c.deleted_at.is_(None)
+                )
+            ).rowcount
+        # Links that were already active count as existing, not created
+        skipped += len(edge_rows) - created
+        
+        # 5. Merge all involved groups once, into the largest one
+        groups = {g for g in [source_group, *[groups.get(row.id) for row in targets]] if g is not None}
+        sizes = dict(db.execute(
+            select(Part.equivalence_group_id, func.count()).where(
+                Part.equivalence_group_id == any_(bindparam("groups", list(groups), type_=ARRAY(PG_UUID(as_uuid=True))))
+            ).group_by(Part.equivalence_group_id)
+        ).all()) if groups else {}
+        final_group = max(groups, key=lambda g: (sizes.get(g, 0), str(g))) if groups else uuid4()
+        
+        absorbed = [g for g in groups if g != final_group]
+        ungrouped = [pid for pid in [source_id, *[row.id for row in targets]] if pid is not None]
+        db.execute(
+            update(Part).where(
+                or_(
+                    Part.equivalence_group_id == any_(bindparam("absorbed", absorbed, type_=ARRAY(PG_UUID(as_uuid=True)))),
+                    and_(
+                        Part.id == any_(bindparam("members", ungrouped, type_=ARRAY(PG_UUID(as_uuid=True)))),
+                        Part.equivalence_group_id.is_(None)
+                    )
+                )
+            ).values(equivalence_group_id=final_group)
+        )
+        logger.info(
+            f"Linked {created} parts to {source_id} in group {final_group} "
+            f"({len(targets) - created} already linked, {len(absorbed)} groups merged)"
+        )
+        
+        target_ids = [row.id for row in targets]
+        defer_index_update(
+            db, lambda index: index.union_pairs([(source_id, target_id) for target_id in target_ids])
+        )
+        
+        return {"created": created, "skipped": skipped, "errors": errors, "auto_created_parts": auto_created}
+
+    @staticmethod
+    def _group_size(db: Session, part_id: UUID, group_id: UUID) -> int:
+        """Number of parts in a group, from the index when it is enabled"""
+        if index_enabled() and equivalence_index.version is not None:
+            return equivalence_index.group_size(part_id)
+        return db.query(func.count(Part.id)).filter(Part.equivalence_group_id == group_id).scalar()
+
     @staticmethod
     def delete_equivalence(
         db: Session, 
         part_id: UUID, 
         equivalent_part_id: UUID, 
         user_id: UUID
-    ) -> None:
+    ) -> bool:
         """
         Soft delete equivalence and update groups.
         May cause group splitting.
+        Returns False, without touching any group, when there is no active
+        link between the two parts.
         """
-        # 1. Soft delete relationship (both directions)
-        db.execute(
+        # 1. Lock the group before writing the link row, the same order as
+        # create_equivalence and bulk_link
+        lock_links(db)
+        group_id = EquivalenceService.lock_groups(db, [part_id, equivalent_part_id]).get(part_id)
+
+        # 2. Soft delete relationship
+        result = db.execute(
             update(parts_equivalence).where(
-                or_(
-                    and_(
-                        parts_equivalence.c.part_id == part_id,
-                        parts_equivalence.c.equivalent_part_id == equivalent_part_id
-                    ),
-                    and_(
-                        parts_equivalence.c.part_id == equivalent_part_id,
-                        parts_equivalence.c.equivalent_part_id == part_id
-                    )
-                )
+                link_filter(part_id, equivalent_part_id),
+                parts_equivalence.c.deleted_at.is_(None)
             ).values(
                 deleted_at=datetime.utcnow(),
                 deleted_by=user_id
             )
         )
+        if result.rowcount == 0:
+            db.rollback()
+            return False
         
-        # 2. Check connectivity and rebuild groups if needed
-        part = db.query(Part).filter(Part.id == part_id).first()
-        if not part or not part.equivalence_group_id:
+        # 3. Check connectivity locally and relabel only a split-off side,
+        # holding the group's lock
+        if group_id is None:
             db.commit()
-            return
-            
-        group_id = part.equivalence_group_id
+            return True
         
-        # Get all parts in this group
-        group_parts = db.query(Part.id).filter(
-            Part.equivalence_group_id == group_id
-        ).all()
-        part_ids = [p.id for p in group_parts]
-        
-        if len(part_ids) <= 1:
-            db.execute(
-                update(Part).where(Part.equivalence_group_id == group_id).values(equivalence_group_id=None)
-            )
+        connected, side = EquivalenceService._reconnects(db, part_id, equivalent_part_id)
+        if connected:
             db.commit()
-            return
-
-        # Build graph of REMAINING active connections within this group
-        active_links = db.execute(
-            select(parts_equivalence.c.part_id, parts_equivalence.c.equivalent_part_id).where(
-                parts_equivalence.c.part_id.in_(part_ids),
-                parts_equivalence.c.equivalent_part_id.in_(part_ids),
-                parts_equivalence.c.deleted_at.is_(None)
-            )
-        ).all()
-        
-        adj = {pid: set() for pid in part_ids}
-        for p1, p2 in active_links:
-            adj[p1].add(p2)
-            adj[p2].add(p1)
-            
-        visited = set()
-        components = []
+            return True
         
-        for pid in part_ids:
-            if pid not in visited:
-                component = set()
-                stack = [pid]
-                while stack:
-                    node = stack.pop()
-                    if node not in visited:
-                        visited.add(node)
-                        component.add(node)
-                        stack.extend(adj[node] - visited)
-                components.append(component)
+        # The fully explored side is its own component now
+        side_ids = list(side)
+        db.execute(
+            update(Part).where(
+                Part.id == any_(bindparam("side_ids", side_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+            ).values(equivalence_group_id=uuid4() if len(side_ids) > 1 else None)
+        )
+        # The other endpoint keeps the old group, unless it is now isolated
+        other_id = equivalent_part_id if part_id in side else part_id
+        db.execute(
+            update(Part).where(
+                Part.id == other_id,
+                ~select(parts_equivalence.c.id).where(
+                    or_(
+                        parts_equivalence.c.part_id == other_id,
+                        parts_equivalence.c.equivalent_part_id == other_id
+                    ),
+                    parts_equivalence.c.deleted_at.is_(None)
+                ).exists()
+            ).values(equivalence_group_id=None)
+        )
+        logger.info(f"Equivalence group {group_id} split: {len(side_ids)} parts moved out")
         
-        if len(components) > 1:
-            logger.info(f"Equivalence group {group_id} split into {len(components)} components")
-            for comp in components:
-                if len(comp) > 1:
-                    new_group_id = uuid4()
-                    db.execute(
-                        update(Part).where(
-                            Part.id.in_(list(comp))
-                        ).values(
-                            equivalence_group_id=new_group_id
-                        )
-                    )
-                else:
-                    db.execute(
-                        update(Part).where(
-                            Part.id.in_(list(comp))
-                        ).values(
-                            equivalence_group_id=None
-                        )
-                    )
-        elif len(components) == 1 and len(components[0]) <= 1:
-             db.execute(
-                update(Part).where(Part.equivalence_group_id == group_id).values(equivalence_group_id=None)
-            )
+        defer_index_update(db, lambda index: index.detach(side))
 
         db.commit()
+        return True
+
+    @staticmethod
+    def _reconnects(db: Session, part_id: UUID, equivalent_part_id: UUID) -> Tuple[bool, Set[UUID]]:
+        """
+        Bidirectional BFS over active links from both endpoints of a removed
+        link, one query per level, always expanding the side that has seen
+        fewer parts. Stops as soon as the two searches meet (still connected)
+        or one side runs out of parts (split). Returns (connected, parts
+        reached by the exhausted side).
+        """
+        visited = {part_id: {part_id}, equivalent_part_id: {equivalent_part_id}}
+        frontier = {part_id: {part_id}, equivalent_part_id: {equivalent_part_id}}
+        
+        while True:
+            start, other = sorted(visited, key=lambda k: len(visited[k]))
+            if not frontier[start]:
+                return False, visited[start]
+            
+            links = symmetric_links()
+            neighbours = db.execute(
+                select(links.c.equivalent_part_id).where(
+                    links.c.part_id == any_(
+                        bindparam("frontier", list(frontier[start]), type_=ARRAY(PG_UUID(as_uuid=True)))
+                    ),
+                    links.c.deleted_at.is_(None)
+                )
+            ).scalars().all()
+            
+            next_frontier = set(neighbours) - visited[start]
+            if next_frontier & visited[other]:
+                return True, set()
+            visited[start] |= next_frontier
+            frontier[start] = next_frontier
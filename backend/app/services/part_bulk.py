@@ -0,0 +1,139 @@
+"""
+Part Bulk Service
+Set-based bulk update and soft-delete/restore for parts:
+- One UPDATE ... FROM (locked old values) ... RETURNING per request
+- Audit rows for every affected part written with a single executemany
+- Dimension statistics refreshed once for all affected part names
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+import logging
+
+from app.models.part import Part
+from app.models.workflow import AuditLog
+from app.services.dimension_stats import DimensionStatsService, DIMENSION_STATS_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+def write_audit_rows(
+    db: Session,
+    action: str,
+    entries: List[Dict[str, Any]],
+    user_id: Optional[Any] = None,
+    request: Optional[Request] = None,
+) -> None:
+    """
+    Insert one audit row per entry ({"entity_id", "changes"}) with a single
+    executemany. Caller is responsible for committing the transaction.
+    """
+    if not entries:
+        return
+    ip_address = request.client.host if request and request.client else None
+    user_agent = request.headers.get("user-agent") if request else None
+    db.execute(insert(AuditLog), [
+        {
+            "user_id": user_id,
+            "action": action,
+            "entity_type": "parts",
+            "entity_id": entry["entity_id"],
+            "changes": jsonable_encoder(entry["changes"]),
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        }
+        for entry in entries
+    ])
+
+
+class PartBulkService:
+
+    @staticmethod
+    def update(
+        db: Session,
+        condition,
+        changes: Dict[str, Any],
+        user_id: Optional[Any] = None,
+        request: Optional[Request] = None,
+    ) -> List[Any]:
+        """
+        Apply the same changes to every non-deleted part matching condition.
+        Returns the (id, part_id) rows that were updated.
+        Caller is responsible for committing the transaction.
+        """
+        fields = sorted(changes)
+        # Lock the targets and capture their old values for the audit trail
+        old = select(Part.id, *[getattr(Part, f) for f in fields]).where(
+            condition, Part.deleted_at.is_(None)
+        ).with_for_update().subquery("old")
+
+        rows = db.execute(
+            update(Part)
+            .where(Part.id == old.c.id)
+            .values(**changes, updated_at=datetime.utcnow())
+            .returning(Part.id, Part.part_id, Part.part_name_en, *[old.c[f].label(f"old_{f}") for f in fields])
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        write_audit_rows(db, "UPDATE", [
+            {
+                "entity_id": row.id,
+                "changes": {
+                    "old": {f: getattr(row, f"old_{f}") for f in fields},
+                    "new": changes,
+                    "bulk": True,
+                },
+            }
+            for row in rows
+        ], user_id, request)
+
+        if DIMENSION_STATS_FIELDS.intersection(changes):
+            names = {row.part_name_en for row in rows}
+            if "part_name_en" in changes:
+                names.update(row.old_part_name_en for row in rows)
+            DimensionStatsService.refresh(db, names)
+
+        logger.info(f"Bulk update of {len(rows)} parts ({', '.join(fields)})")
+        return rows
+
+    @staticmethod
+    def set_deleted(
+        db: Session,
+        condition,
+        deleted: bool = True,
+        user_id: Optional[Any] = None,
+        request: Optional[Request] = None,
+    ) -> List[Any]:
+        """
+        Soft delete (or restore) every part matching condition whose state
+        changes. Returns the (id, part_id) rows that were affected.
+        Caller is responsible for committing the transaction.
+        """
+        now = datetime.utcnow()
+        state_filter = Part.deleted_at.is_(None) if deleted else Part.deleted_at.isnot(None)
+        rows = db.execute(
+            update(Part)
+            .where(condition, state_filter)
+            .values(deleted_at=now if deleted else None, updated_at=now)
+            .returning(Part.id, Part.part_id, Part.designation, Part.part_name_en)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        write_audit_rows(db, "DELETE" if deleted else "RESTORE", [
+            {
+                "entity_id": row.id,
+                "changes": {
+                    ("old" if deleted else "new"): {"part_id": row.part_id, "designation": row.designation},
+                    "bulk": True,
+                },
+            }
+            for row in rows
+        ], user_id, request)
+
+        DimensionStatsService.refresh(db, [row.part_name_en for row in rows])
+
+        logger.info(f"Bulk {'delete' if deleted else 'restore'} of {len(rows)} parts")
+        return rows
@@ -0,0 +1,256 @@
+"""
+Part Import Service
+High-throughput CSV import for the parts catalog:
+- COPY the file into a temporary staging table
+- Validate rows and foreign keys with set-based UPDATEs
+- Upsert valid rows with INSERT ... ON CONFLICT (part_id)
+- Report per-row errors straight from the staging table
+"""
+import csv
+from typing import Dict, Any, IO
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+import logging
+
+from app.core.database import copy_from_stream
+from app.services.dimension_stats import DimensionStatsService
+
+logger = logging.getLogger(__name__)
+
+STAGE_TABLE = "parts_import_stage"
+
+# CSV columns accepted by the importer. mfg_id and position_id are the
+# human-readable codes (manufacturers.mfg_id, position_translation.position_id),
+# the same values GET /parts/export writes.
+IMPORT_COLUMNS = [
+    "part_id", "mfg_id", "part_name_en", "position_id", "drive_side", "designation",
+    "moq", "weight", "width", "length", "height", "note", "image_url",
+]
+
+# Staging column -> SQL expression producing the typed value for `parts`
+_TYPED_VALUES = {
+    "mfg_id": "s.mfg_uuid",
+    "part_name_en": "NULLIF(s.part_name_en, '')",
+    "position_id": "s.position_uuid",
+    "drive_side": "COALESCE(NULLIF(s.drive_side, ''), 'NA')::drive_side_enum",
+    "designation": "NULLIF(s.designation, '')",
+    "moq": "NULLIF(s.moq, '')::integer",
+    "weight": "NULLIF(s.weight, '')::numeric",
+    "width": "NULLIF(s.width, '')::numeric",
+    "length": "NULLIF(s.length, '')::numeric",
+    "height": "NULLIF(s.height, '')::numeric",
+    "note": "NULLIF(s.note, '')",
+    "image_url": "NULLIF(s.image_url, '')",
+}
+
+# Columns stored as-is apart from surrounding whitespace
+_TRIMMED_COLUMNS = ["part_id", "mfg_id", "part_name_en", "position_id", "moq", "weight", "width", "length", "height"]
+
+# Non-negative decimal with up to 8 integer digits (values are trimmed first)
+_DECIMAL = "'^\\d{1,8}(\\.\\d*)?$'"
+
+# Parts' Numeric(10, 2) columns; the cast rounds to 2 decimals, so e.g.
+# 99999999.999 passes the format check but would overflow. The CASE keeps
+# the cast away from values that failed the format check.
+_DECIMAL_COLUMNS = ["weight", "width", "length", "height"]
+
+# Validation rules: (condition on staging row, error message)
+_ROW_CHECKS = [
+    ("s.part_id IS NULL", "part_id is required"),
+    ("length(s.part_id) > 12", "part_id longer than 12 characters"),
+    ("length(s.part_name_en) > 60", "part_name_en longer than 60 characters"),
+    ("s.drive_side NOT IN ('', 'NA', 'LHD', 'RHD')", "drive_side must be NA, LHD or RHD"),
+    ("length(s.designation) > 255", "designation longer than 255 characters"),
+    ("s.moq !~ '^\\d{0,9}$'", "moq must be a non-negative integer"),
+] + [
+    (
+        f"CASE WHEN COALESCE(s.{c}, '') = '' THEN false WHEN s.{c} ~ {_DECIMAL} "
+        f"THEN round(s.{c}::numeric, 2) >= 100000000 ELSE true END",
+        f"{c} must be a non-negative number below 10^8"
+    )
+    for c in _DECIMAL_COLUMNS
+]
+
+
+class PartImportService:
+
+    @staticmethod
+    def import_csv(
+        db: Session,
+        stream: IO[str],
+        max_errors: int = 1000,
+        restore_deleted: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import parts from a CSV text stream.
+        Rows that fail validation are skipped and reported; valid rows are
+        inserted or, when part_id already exists, updated in place. Only the
+        columns present in the file are written on update. A row whose part_id
+        belongs to a soft-deleted part is rejected unless restore_deleted is
+        set, in which case the part is restored and updated.
+        Caller is responsible for committing the transaction.
+        """
+        header = next(csv.reader([stream.readline()]), [])
+        columns = [c.strip() for c in header]
+
+        unknown = [c for c in columns if c not in IMPORT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        if "part_id" not in columns:
+            raise ValueError("Missing required column: part_id")
+        if len(set(columns)) != len(columns):
+            raise ValueError("Duplicate column names in header")
+
+        # 1. Stage raw text values
+        db.execute(text(f"""
+            CREATE TEMP TABLE {STAGE_TABLE} (
+                row_num BIGINT GENERATED ALWAYS AS IDENTITY,
+                {", ".join(f"{c} TEXT" for c in IMPORT_COLUMNS)},
+                newlines INTEGER,
+                mfg_uuid UUID,
+                position_uuid UUID,
+                error TEXT
+            ) ON COMMIT DROP
+        """))
+        copy_from_stream(
+            db,
+            f"COPY {STAGE_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            stream
+        )
+        # Line breaks inside quoted fields, so errors can point at file lines
+        record_text = f"concat({', '.join(columns)})"
+        db.execute(text(f"""
+            UPDATE {STAGE_TABLE} SET
+                newlines = length({record_text}) - length(replace({record_text}, E'\\n', '')),
+                {", ".join(f"{c} = btrim({c})" for c in _TRIMMED_COLUMNS if c != "part_id")},
+                part_id = NULLIF(btrim(part_id), ''),
+                drive_side = upper(btrim(COALESCE(drive_side, '')))
+        """))
+
+        # 2. Row-level validation
+        for condition, message in _ROW_CHECKS:
+            PartImportService._flag(db, condition, message)
+
+        db.execute(text(f"""
+            UPDATE {STAGE_TABLE} s SET error = concat_ws('; ', s.error, 'duplicate part_id, superseded by row ' || (d.last_row + 1))
+            FROM (
+                SELECT part_id, max(row_num) AS last_row FROM {STAGE_TABLE}
+                WHERE part_id IS NOT NULL GROUP BY part_id HAVING count(*) > 1
+            ) d
+            WHERE s.part_id = d.part_id AND s.row_num < d.last_row
+        """))
+
+        # 3. Foreign keys, resolved with set-based joins
+        db.execute(text(f"""
+            UPDATE {STAGE_TABLE} s SET mfg_uuid = m.id
+            FROM manufacturers m
+            WHERE m.mfg_id = btrim(s.mfg_id) AND m.deleted_at IS NULL
+        """))
+        PartImportService._flag(
+            db, "NULLIF(btrim(s.mfg_id), '') IS NOT NULL AND s.mfg_uuid IS NULL",
+            "manufacturer not found"
+        )
+
+        db.execute(text(f"""
+            UPDATE {STAGE_TABLE} s SET position_uuid = p.id
+            FROM position_translation p
+            WHERE p.position_id = btrim(s.position_id)
+        """))
+        PartImportService._flag(
+            db, "NULLIF(btrim(s.position_id), '') IS NOT NULL AND s.position_uuid IS NULL",
+            "position not found"
+        )
+
+        PartImportService._flag(
+            db,
+            "NULLIF(s.part_name_en, '') IS NOT NULL AND NOT EXISTS ("
+            "SELECT 1 FROM part_translation_standardization t WHERE t.part_name_en = s.part_name_en)",
+            "part_name_en not found in translations"
+        )
+
+        if restore_deleted:
+            restored = db.execute(text(f"""
+                SELECT count(*) FROM {STAGE_TABLE} s
+                JOIN parts p ON p.part_id = s.part_id
+                WHERE s.error IS NULL AND p.deleted_at IS NOT NULL
+            """)).scalar()
+        else:
+            restored = 0
+            PartImportService._flag(
+                db,
+                "EXISTS (SELECT 1 FROM parts p WHERE p.part_id = s.part_id AND p.deleted_at IS NOT NULL)",
+                "part_id belongs to a deleted part (import with restore_deleted to restore it)"
+            )
+
+        # Part names whose dimension statistics the upsert can change
+        affected_names = db.execute(text(f"""
+            SELECT NULLIF(s.part_name_en, '') FROM {STAGE_TABLE} s WHERE s.error IS NULL
+            UNION
+            SELECT p.part_name_en FROM parts p
+            JOIN {STAGE_TABLE} s ON s.part_id = p.part_id
+            WHERE s.error IS NULL
+        """)).scalars().all()
+
+        # 4. Upsert valid rows in one statement
+        write_columns = [c for c in columns if c != "part_id"]
+        insert_columns = ["id", "part_id", *write_columns, "status", "approval_status", "created_at", "updated_at"]
+        select_values = [
+            "gen_random_uuid()", "s.part_id", *[_TYPED_VALUES[c] for c in write_columns],
+            "'active'", "'APPROVED'::approvalstatus", "now()", "now()"
+        ]
+        update_set = [f"{c} = EXCLUDED.{c}" for c in write_columns]
+        update_set += ["updated_at = now()", "deleted_at = NULL"]
+
+        counts = db.execute(text(f"""
+            WITH upserted AS (
+                INSERT INTO parts ({", ".join(insert_columns)})
+                SELECT {", ".join(select_values)}
+                FROM {STAGE_TABLE} s
+                WHERE s.error IS NULL
+                ON CONFLICT (part_id) DO UPDATE SET {", ".join(update_set)}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted) AS created,
+                   count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM upserted
+        """)).one()
+        created, updated = counts.created, counts.updated
+        DimensionStatsService.refresh(db, affected_names)
+
+        # 5. Per-row errors. row is the CSV record number as a spreadsheet shows
+        # it (header is row 1); line is the file line the record starts on,
+        # which differs once a quoted field spans several lines
+
+        error_count = db.execute(
+            text(f"SELECT count(*) FROM {STAGE_TABLE} WHERE error IS NOT NULL")
+        ).scalar()
+        error_rows = db.execute(text(f"""
+            SELECT row_num + 1 AS row, line, part_id, error FROM (
+                SELECT row_num, part_id, error,
+                       row_num + 1 + COALESCE(sum(newlines) OVER (
+                           ORDER BY row_num ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0) AS line
+                FROM {STAGE_TABLE}
+            ) numbered
+            WHERE error IS NOT NULL ORDER BY row_num LIMIT :limit
+        """), {"limit": max_errors}).all()
+
+        logger.info(f"Parts import: {created} created, {updated} updated, {error_count} rejected")
+
+        return {
+            "created": created,
+            "updated": updated,
+            "restored": restored,
+            "error_count": error_count,
+            "errors": [
+                {"row": r.row, "line": r.line, "part_id": r.part_id, "error": r.error} for r in error_rows
+            ]
+        }
+
+    @staticmethod
+    def _flag(db: Session, condition: str, message: str) -> None:
+        """Append an error message to every staged row matching condition"""
+        db.execute(
+            text(f"UPDATE {STAGE_TABLE} s SET error = concat_ws('; ', s.error, :message) WHERE {condition}"),
+            {"message": message}
+        )
@@ -0,0 +1,72 @@
+"""
+Check Equivalence Groups
+Verifies parts.equivalence_group_id against the active parts_equivalence links,
+one component at a time. Cheap enough to run from cron every few minutes with
+--since-minutes; use rebuild_equivalence_groups.py for a full-catalog pass.
+
+Usage:
+    python scripts/check_equivalence_groups.py --since-minutes 10            # report only
+    python scripts/check_equivalence_groups.py --since-minutes 10 --repair   # fix in place
+    python scripts/check_equivalence_groups.py --group <group uuid> --repair
+"""
+import argparse
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.equivalence_check import EquivalenceCheckService, CHECK_MAX_PARTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check equivalence groups against parts_equivalence")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--group", type=UUID, help="Check the component(s) of one equivalence group")
+    target.add_argument("--since", type=datetime.fromisoformat, help="Check components touched since this ISO-8601 instant")
+    target.add_argument("--since-minutes", type=float, help="Check components touched in the last N minutes")
+    parser.add_argument("--repair", action="store_true", help="Rewrite mismatched groups (one commit per component)")
+    parser.add_argument("--max-parts", type=int, default=CHECK_MAX_PARTS, help="Skip components larger than this")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.group:
+            seeds = EquivalenceCheckService.group_seeds(db, args.group)
+        else:
+            since = args.since or datetime.now(timezone.utc) - timedelta(minutes=args.since_minutes)
+            seeds = EquivalenceCheckService.changed_seeds(db, since)
+        print(f"Checking from {len(seeds):,} seed parts" + (" (repair)" if args.repair else ""))
+
+        reports = []
+        for report in EquivalenceCheckService.iter_components(db, seeds, args.repair, args.max_parts):
+            for m in report["mismatches"]:
+                print(f"   {m['part_id']}: {m['old_group_id']} -> {m['new_group_id']}")
+            if args.repair:
+                EquivalenceCheckService.audit_repair(db, report)
+                db.commit()
+            reports.append(report)
+        db.rollback()
+
+        summary = EquivalenceCheckService.summarize(reports)
+        print(f"\nComponents: {summary['components']:,} ({summary['parts']:,} parts, {summary['skipped']:,} skipped)")
+        print(f"Mismatched: {summary['mismatched']:,}")
+        if args.repair:
+            print(f"Repaired:   {summary['repaired']:,}")
+
+        # Non-zero exit for monitoring when mismatches were left in place
+        if summary["mismatched"] > summary["repaired"] or summary["skipped"]:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
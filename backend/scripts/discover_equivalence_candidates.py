@@ -0,0 +1,79 @@
+"""
+Discover Equivalence Candidates
+Suggests pairs of interchangeable parts that are not yet in the same
+equivalence group: same part_name_en and position, dimensions within
+tolerance and similar designations. Writes the ranked pairs as CSV for
+analysts to review; nothing is linked automatically.
+
+Usage:
+    python scripts/discover_equivalence_candidates.py -o candidates.csv
+    python scripts/discover_equivalence_candidates.py --tolerance 0.02 --min-similarity 0.5 --limit 500
+"""
+import argparse
+import csv
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.equivalence_candidates import EquivalenceCandidateService
+
+COLUMNS = [
+    "score", "dimension_score", "designation_similarity", "part_name_en", "position_id",
+    "part_id", "designation", "equivalent_part_id", "equivalent_designation", "id", "equivalent_id",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank candidate part equivalences")
+    parser.add_argument("-o", "--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("--limit", type=int, default=10000, help="Number of best pairs to keep")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Relative tolerance per dimension")
+    parser.add_argument("--abs-tolerance", type=float, default=0.01, help="Absolute tolerance per dimension")
+    parser.add_argument("--min-dimensions", type=int, default=2, choices=range(1, 5),
+                        help="Dimensions both parts must have")
+    parser.add_argument("--min-similarity", type=float, default=None,
+                        help="Minimum designation trigram similarity (default: PARTS_SEARCH_MIN_SIMILARITY)")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows fetched per server-side cursor batch")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+
+    def progress(message):
+        print(f"   [{time.monotonic() - started:7.1f}s] {message}", file=sys.stderr, flush=True)
+
+    db = SessionLocal()
+    try:
+        summary = EquivalenceCandidateService.discover(
+            db,
+            limit=args.limit,
+            rel_tolerance=args.tolerance,
+            abs_tolerance=args.abs_tolerance,
+            min_dimensions=args.min_dimensions,
+            min_similarity=args.min_similarity,
+            batch_size=args.batch_size,
+            progress=progress,
+        )
+        out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+        try:
+            writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(summary["candidates"])
+        finally:
+            if args.output:
+                out.close()
+
+        progress(
+            f"✓ {summary['pairs']:,} pairs over {summary['parts']:,} parts in {summary['blocks']:,} blocks "
+            f"({summary['skipped_blocks']:,} skipped), wrote {len(summary['candidates']):,}"
+        )
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
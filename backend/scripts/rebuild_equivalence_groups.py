@@ -0,0 +1,66 @@
+"""
+Rebuild Equivalence Groups
+Recomputes parts.equivalence_group_id from the active parts_equivalence links
+for the whole catalog. Replaces migrate_equivalence_data.py for large catalogs:
+links are streamed, components come from an array-based union-find and all
+changes are written with COPY + a single UPDATE ... FROM.
+
+Usage:
+    python scripts/rebuild_equivalence_groups.py --dry-run   # show the diff only
+    python scripts/rebuild_equivalence_groups.py             # apply
+"""
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.equivalence_rebuild import EquivalenceRebuildService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild equivalence groups from parts_equivalence")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows fetched per server-side cursor batch")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+
+    def progress(message):
+        print(f"   [{time.monotonic() - started:7.1f}s] {message}", flush=True)
+
+    db = SessionLocal()
+    try:
+        print("=" * 60)
+        print("EQUIVALENCE GROUPS REBUILD" + (" (DRY RUN)" if args.dry_run else ""))
+        print("=" * 60)
+
+        summary = EquivalenceRebuildService.rebuild(
+            db, dry_run=args.dry_run, batch_size=args.batch_size, progress=progress
+        )
+
+        print(f"\nLinked parts:   {summary['parts']:,}")
+        print(f"Groups:         {summary['groups']:,}")
+        print(f"Parts changing: {summary['changed']:,} "
+              f"({summary['grouped']:,} newly grouped, {summary['ungrouped']:,} ungrouped, {summary['moved']:,} moved)")
+        for row in summary["sample"]:
+            print(f"   {row['part_id']}: {row['old_group_id']} -> {row['new_group_id']}")
+
+        if args.dry_run:
+            print("\n✓ Dry run complete, nothing written")
+        else:
+            db.commit()
+            print(f"\n✓ Updated {summary['updated']:,} parts")
+    except Exception as e:
+        print(f"\n✗ ERROR: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()